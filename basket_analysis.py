@@ -0,0 +1,265 @@
+"""
+Blinkit Sales Performance Analytics - Market Basket Analysis
+Frequently-bought-together product pairs with support, confidence and lift,
+network-wide and per city, from the real order -> product baskets
+
+Engine:
+- Baskets become a sparse binary order x product incidence matrix X (CSR)
+- Pair counts come from the sparse product X.T @ X, accumulated over chunks of
+  orders and kept upper-triangular, so no dense product x product matrix exists
+- Products bought in fewer than --min-orders orders are dropped before the
+  product (a pair can never be more frequent than either of its items)
+- Rules are pruned to the top K consequents per antecedent by lift
+
+Usage:
+    python basket_analysis.py                         # generated data, per city
+    python basket_analysis.py --source datasets       # Kaggle-style Datasets/, per store
+    python basket_analysis.py --benchmark 2000000     # timing on 2M synthetic orders
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+import scipy.sparse as sp
+import warnings
+warnings.filterwarnings('ignore')
+
+from group_ops import grouped_top_k
+
+MIN_PAIR_ORDERS = 5
+TOP_K = 10
+MAX_CHUNK_ORDERS = 500_000
+MAX_WORKERS = 8
+
+SOURCES = {
+    'generated': {
+        'directory': '.',
+        'order_items': 'order_items.csv',
+        'orders': 'orders.csv',
+        'products': 'products.csv',
+        'group': 'city',
+    },
+    'datasets': {
+        'directory': 'Datasets',
+        'order_items': 'blinkit_order_items.csv',
+        'orders': 'blinkit_orders.csv',
+        'products': 'blinkit_products.csv',
+        'group': 'store_id',
+    },
+}
+
+
+def incidence_matrix(order_codes, product_codes, n_orders, n_products):
+    """Binary CSR order x product matrix; repeated lines of a product count once."""
+    X = sp.csr_matrix((np.ones(len(order_codes), dtype=np.int32), (order_codes, product_codes)),
+                      shape=(n_orders, n_products))
+    X.sum_duplicates()
+    X.data[:] = 1
+    return X
+
+
+def cooccurrence(X, chunk_orders=MAX_CHUNK_ORDERS):
+    """Upper-triangular (i < j) product pair counts as COO, summed over order chunks."""
+    counts = sp.csr_matrix((X.shape[1], X.shape[1]), dtype=np.int64)
+    for start in range(0, X.shape[0], chunk_orders):
+        block = X[start:start + chunk_orders]
+        counts = counts + sp.triu(block.T @ block, k=1, format='csr')
+    return counts.tocoo()
+
+
+def pair_rules(X, min_pair_orders=MIN_PAIR_ORDERS, top_k=TOP_K):
+    """Association rules A -> B for one incidence matrix.
+
+    Returns antecedent/consequent product codes with pair_orders, support,
+    confidence and lift, keeping the top_k consequents per antecedent by lift.
+    """
+    n_orders = X.shape[0]
+    item_orders = np.bincount(X.indices, minlength=X.shape[1])
+    frequent = np.flatnonzero(item_orders >= min_pair_orders)
+    empty = pd.DataFrame(columns=['antecedent', 'consequent', 'pair_orders',
+                                  'support', 'confidence', 'lift', 'rank'])
+    if n_orders == 0 or len(frequent) < 2:
+        return empty
+
+    pairs = cooccurrence(X[:, frequent])
+    keep = pairs.data >= min_pair_orders
+    if not keep.any():
+        return empty
+    a, b = frequent[pairs.row[keep]], frequent[pairs.col[keep]]
+    n_ab = pairs.data[keep].astype(np.float64)
+
+    # Lift is symmetric but confidence is not, so emit both directions
+    antecedent, consequent = np.concatenate([a, b]), np.concatenate([b, a])
+    n_ab = np.concatenate([n_ab, n_ab])
+    n_a, n_b = item_orders[antecedent], item_orders[consequent]
+    lift = n_ab * n_orders / (n_a * n_b)
+
+    rows, ranks = grouped_top_k(lift, antecedent, top_k, largest=True)
+    return pd.DataFrame({
+        'antecedent': antecedent[rows],
+        'consequent': consequent[rows],
+        'pair_orders': n_ab[rows].astype(np.int64),
+        'support': n_ab[rows] / n_orders,
+        'confidence': n_ab[rows] / n_a[rows],
+        'lift': lift[rows],
+        'rank': ranks,
+    })
+
+
+def load_baskets(source='generated'):
+    """Order lines with product codes, sorted so each group's orders are contiguous."""
+    config = SOURCES[source]
+    path = lambda key: os.path.join(config['directory'], config[key])
+    group = config['group']
+
+    items = pd.read_csv(path('order_items'), usecols=['order_id', 'product_id'])
+    orders = pd.read_csv(path('orders'), usecols=['order_id', group])
+    products = pd.read_csv(path('products'), usecols=['product_id', 'product_name', 'category'])
+
+    items = items.merge(orders, on='order_id', how='inner')
+    items[group] = items[group].astype(str)
+    items = items.sort_values([group, 'order_id'], kind='stable').reset_index(drop=True)
+    items['order_code'] = pd.factorize(items['order_id'])[0]
+    items['product_code'], product_ids = pd.factorize(items['product_id'], sort=True)
+    catalog = (products.drop_duplicates('product_id').set_index('product_id')
+               .reindex(pd.Index(product_ids, name='product_id')).reset_index())
+    return items, catalog, group
+
+
+def _group_rules(order_codes, product_codes, n_products, min_pair_orders, top_k):
+    """Rules for one group's lines (order codes already rebased to start at 0)."""
+    X = incidence_matrix(order_codes, product_codes, int(order_codes.max()) + 1, n_products)
+    return pair_rules(X, min_pair_orders, top_k)
+
+
+def basket_rules(items, catalog, group, min_pair_orders=MIN_PAIR_ORDERS,
+                 top_k=TOP_K, workers=1):
+    """Network-wide ('All') and per-group rules, labelled with product names."""
+    n_products = len(catalog)
+    order_codes = items['order_code'].to_numpy()
+    product_codes = items['product_code'].to_numpy()
+
+    labels, args = ['All'], [(order_codes, product_codes)]
+    for label, rows in items.groupby(group, sort=True).indices.items():
+        labels.append(label)
+        args.append((order_codes[rows] - order_codes[rows].min(), product_codes[rows]))
+    args = [(o, p, n_products, min_pair_orders, top_k) for o, p in args]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_group_rules, *zip(*args)))
+    else:
+        results = [_group_rules(*a) for a in args]
+
+    frames = [r.assign(group=label) for label, r in zip(labels, results) if len(r)]
+    if not frames:
+        return pd.DataFrame()
+
+    rules = pd.concat(frames, ignore_index=True)
+    rules = rules.merge(catalog.add_prefix('antecedent_'), left_on='antecedent', right_index=True)
+    rules = rules.merge(catalog.add_prefix('consequent_'), left_on='consequent', right_index=True)
+    columns = ['group', 'rank', 'antecedent_product_id', 'antecedent_product_name',
+               'antecedent_category', 'consequent_product_id', 'consequent_product_name',
+               'consequent_category', 'pair_orders', 'support', 'confidence', 'lift']
+    return rules[columns].sort_values(['group', 'antecedent_product_id', 'rank'],
+                                      ignore_index=True)
+
+
+def run_benchmark(n_orders, n_skus=30_000, mean_items=3.0, seed=42):
+    """Time incidence build, sparse co-occurrence and rule extraction on Zipf baskets."""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    basket_sizes = 1 + rng.poisson(mean_items - 1, size=n_orders)
+    order_codes = np.repeat(np.arange(n_orders), basket_sizes)
+    popularity = 1.0 / np.arange(1, n_skus + 1) ** 1.1
+    product_codes = rng.choice(n_skus, size=len(order_codes), p=popularity / popularity.sum())
+    generated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    X = incidence_matrix(order_codes, product_codes, n_orders, n_skus)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = cooccurrence(X)
+    pair_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rules = pair_rules(X)
+    rule_time = time.perf_counter() - start
+
+    dense_gb = n_skus ** 2 * 8 / 1e9
+    sparse_mb = (pairs.data.nbytes + pairs.row.nbytes + pairs.col.nbytes) / 1e6
+    print(f"  Synthetic data:   {n_orders:,} orders x {n_skus:,} SKUs "
+          f"({len(order_codes):,} lines, {generated:.2f}s)")
+    print(f"  Incidence matrix: {build_time:.2f}s ({X.nnz:,} non-zeros)")
+    print(f"  Co-occurrence:    {pair_time:.2f}s ({pairs.nnz:,} pairs, {sparse_mb:,.0f} MB "
+          f"vs {dense_gb:,.1f} GB dense)")
+    print(f"  Rules (top {TOP_K}):    {rule_time:.2f}s ({len(rules):,} rules)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sparse market basket analysis')
+    parser.add_argument('--source', choices=sorted(SOURCES), default='generated')
+    parser.add_argument('--min-orders', type=int, default=MIN_PAIR_ORDERS,
+                        help='minimum orders containing a pair')
+    parser.add_argument('-k', '--top-k', type=int, default=TOP_K,
+                        help='consequents kept per antecedent')
+    parser.add_argument('-w', '--workers', type=int, default=min(MAX_WORKERS, os.cpu_count() or 1))
+    parser.add_argument('--benchmark', type=int, default=None, metavar='N_ORDERS',
+                        help='time the engine on N synthetic orders instead of real baskets')
+    parser.add_argument('--skus', type=int, default=30_000, help='SKUs for --benchmark')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("MARKET BASKET ANALYSIS")
+    print("="*70)
+
+    if args.benchmark:
+        print(f"\n[Benchmark] {args.benchmark:,} synthetic orders...")
+        run_benchmark(args.benchmark, args.skus)
+        print("\n" + "="*70)
+        return
+
+    print(f"\n[1] Loading baskets ({args.source})...")
+    items, catalog, group = load_baskets(args.source)
+    basket_sizes = items.groupby('order_code').size()
+    print(f"✓ {len(basket_sizes):,} orders, {len(catalog):,} products, "
+          f"{items[group].nunique()} {group} groups")
+    print(f"  Multi-item baskets: {(basket_sizes > 1).mean() * 100:.1f}% "
+          f"(avg {basket_sizes.mean():.2f} items)")
+
+    print(f"\n[2] Mining pairs (min {args.min_orders} orders, top {args.top_k} per product)...")
+    start = time.perf_counter()
+    rules = basket_rules(items, catalog, group, args.min_orders, args.top_k, max(1, args.workers))
+    if rules.empty:
+        print("  No product pair reaches the minimum order count - lower --min-orders "
+              "or use a source with multi-item baskets")
+        print("\n" + "="*70)
+        return
+    print(f"✓ {len(rules):,} rules in {time.perf_counter() - start:.2f}s")
+
+    rules.to_csv('basket_rules.csv', index=False)
+    print("\n✓ Saved: basket_rules.csv")
+
+    print("\nTop Pairs by Lift (network):")
+    top = rules[rules['group'] == 'All'].sort_values(['lift', 'pair_orders'], ascending=False)
+    pair_key = np.sort(top[['antecedent_product_id', 'consequent_product_id']].astype(str).to_numpy(), axis=1)
+    top = top[~pd.DataFrame(pair_key, index=top.index).duplicated()].head(10)
+    print(top[['antecedent_product_name', 'consequent_product_name', 'pair_orders',
+               'confidence', 'lift']].round(3).to_string(index=False))
+
+    print(f"\nStrongest Pair per {group}:")
+    best = (rules[rules['group'] != 'All'].sort_values('lift', ascending=False)
+            .drop_duplicates('group').sort_values('group'))
+    print(best[['group', 'antecedent_product_name', 'consequent_product_name',
+                'pair_orders', 'lift']].round(3).to_string(index=False))
+
+    print("\n" + "="*70)
+
+
+if __name__ == '__main__':
+    main()
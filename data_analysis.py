@@ -4,13 +4,16 @@ Data cleaning, feature engineering, and business-driven EDA
 """
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from data_quality import run_quality_checks, print_report
+from kpi_stats import (late_delivery_retention, city_kpi_intervals,
+                       high_discount_margin, category_discount_margin, format_effect)
+
 # Visualization setup
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -25,28 +28,22 @@ products = pd.read_csv('products.csv')
 customers = pd.read_csv('customers.csv')
 orders = pd.read_csv('orders.csv')
 payments = pd.read_csv('payments.csv')
+order_items = pd.read_csv('order_items.csv')
 
 print(f"✓ Products: {len(products):,} rows")
 print(f"✓ Customers: {len(customers):,} rows")
 print(f"✓ Orders: {len(orders):,} rows")
+print(f"✓ Order items: {len(order_items):,} rows")
 print(f"✓ Payments: {len(payments):,} rows")
 
 # DATA CLEANING
 print("\n[2] Data Quality Check...")
 
-# Check nulls
-print("\nNull Values:")
-for df_name, df in [('products', products), ('customers', customers), 
-                     ('orders', orders), ('payments', payments)]:
-    null_count = df.isnull().sum().sum()
-    print(f"  {df_name}: {null_count} nulls")
-
-# Check duplicates
-print("\nDuplicate Records:")
-for df_name, df in [('products', products), ('customers', customers), 
-                     ('orders', orders), ('payments', payments)]:
-    dup_count = df.duplicated().sum()
-    print(f"  {df_name}: {dup_count} duplicates")
+# Streaming profile: nulls, duplicate keys/rows, referential integrity
+quality_report = run_quality_checks('generated', '.', verbose=False)
+print_report(quality_report)
+if not quality_report['gate']['passed']:
+    print("  ⚠ Quality gate failed - results below may be unreliable")
 
 # Data type corrections
 orders['order_date'] = pd.to_datetime(orders['order_date'])
@@ -63,25 +60,10 @@ df = df.merge(customers[['customer_id', 'acquisition_channel', 'repeat_customer_
 # Calculate order-level metrics
 df['order_value'] = df['final_amount'] + df['discount_amount']
 
-# For product-level analysis, create order-product mapping
-# Simplified: assume average basket of 2 items
-order_products = []
-for _, order in df.iterrows():
-    # Randomly assign 1-3 products per order
-    n_items = np.random.choice([1, 2, 3], p=[0.4, 0.4, 0.2])
-    selected_products = products.sample(n_items)
-    
-    for _, product in selected_products.iterrows():
-        order_products.append({
-            'order_id': order['order_id'],
-            'product_id': product['product_id'],
-            'category': product['category'],
-            'sub_category': product['sub_category'],
-            'selling_price': product['selling_price'],
-            'cost_price': product['cost_price']
-        })
-
-order_products_df = pd.DataFrame(order_products)
+# For product-level analysis, map each order to the products in its basket
+order_products_df = order_items[['order_id', 'product_id']].merge(
+    products[['product_id', 'category', 'sub_category', 'selling_price', 'cost_price']],
+    on='product_id', how='left')
 
 # Calculate profit metrics
 order_products_df['profit'] = order_products_df['selling_price'] - order_products_df['cost_price']
@@ -165,6 +147,12 @@ print(delivery_retention)
 correlation = df[['delivery_time_minutes', 'repeat_customer_flag']].corr().iloc[0, 1]
 print(f"\nCorrelation: {correlation:.3f}")
 
+# Bootstrap CI + permutation p-value, network-wide and per city
+retention_test = late_delivery_retention(df)
+print("\nRepeat Rate Change, Customers With a Late Delivery (pp, 95% CI, permutation p; per customer):")
+for city, row in retention_test.iterrows():
+    print(f"  {city:<10} {format_effect(row, 'pp', 100)}")
+
 # Analysis 3: City-wise Profitability
 print("\n[A3] City-wise Performance Analysis")
 print("-"*70)
@@ -183,6 +171,10 @@ city_metrics = city_metrics.sort_values('Profit', ascending=False)
 print("\nCity Performance Ranking:")
 print(city_metrics)
 
+city_intervals = city_kpi_intervals(df)
+print("\nCity Avg Order Margin & SLA Breach (95% bootstrap CI):")
+print(city_intervals.loc[city_metrics.index].round(2))
+
 # Analysis 4: Discount Impact on Profitability
 print("\n[A4] Discount vs Profitability Analysis")
 print("-"*70)
@@ -202,6 +194,14 @@ discount_analysis.columns = ['Avg_Profit_Margin_%', 'Total_Revenue', 'Orders']
 print("\nDiscount Impact:")
 print(discount_analysis)
 
+# >15% vs 0-5% discount margin gap, per city (orders) and per category (order x category)
+discount_test = high_discount_margin(df, 'city')
+discount_category_test = category_discount_margin(
+    df_detailed.merge(df[['order_id', 'discount_bucket']], on='order_id', how='left'))
+print("\nMargin Change, >15% vs 0-5% Discount (pp, 95% CI, permutation p):")
+for label, row in pd.concat([discount_test, discount_category_test]).iterrows():
+    print(f"  {label:<24} {format_effect(row, 'pp')}")
+
 # Analysis 5: Category Performance
 print("\n[A5] Category-wise Performance")
 print("-"*70)
@@ -318,11 +318,12 @@ print(f"   SLA Breach Rate: {sla_breach_rate:.1f}%")
 print(f"\n3. CUSTOMER RETENTION")
 repeat_rate = df['repeat_customer_flag'].mean() * 100
 print(f"   Repeat Customer Rate: {repeat_rate:.1f}%")
-print(f"   Impact of Late Delivery: {(1-correlation)*100:.1f}% reduction in retention")
+print(f"   Impact of Late Delivery: {format_effect(retention_test.loc['All'], 'pp', 100)} "
+      f"change in repeat rate")
 
 print(f"\n4. DISCOUNT EFFICIENCY")
 avg_discount = df['discount_pct'].mean()
 print(f"   Average Discount: {avg_discount:.2f}%")
-print(f"   High discount (>15%) reduces margin by {discount_analysis.loc['>15%', 'Avg_Profit_Margin_%'] - discount_analysis.loc['0-5%', 'Avg_Profit_Margin_%']:.2f}%")
+print(f"   High discount (>15%) vs 0-5% margin: {format_effect(discount_test.loc['All'], 'pp')}")
 
 print("\n" + "="*70)
\ No newline at end of file
@@ -140,6 +140,7 @@ date_range = (end_date - start_date).days
 
 orders_data = []
 payments_data = []
+order_items_data = []
 
 for i in range(1, NUM_ORDERS + 1):
     # Temporal distribution - more recent orders
@@ -202,6 +203,14 @@ for i in range(1, NUM_ORDERS + 1):
         'order_status': order_status
     })
     
+    for product_id, selling_price in zip(order_products['product_id'], order_products['selling_price']):
+        order_items_data.append({
+            'order_id': f'ORD{i:07d}',
+            'product_id': product_id,
+            'quantity': 1,
+            'unit_price': selling_price
+        })
+
     payments_data.append({
         'order_id': f'ORD{i:07d}',
         'payment_mode': payment_mode,
@@ -211,18 +220,23 @@ for i in range(1, NUM_ORDERS + 1):
 
 orders_df = pd.DataFrame(orders_data)
 payments_df = pd.DataFrame(payments_data)
+order_items_df = pd.DataFrame(order_items_data)
 
 # Save all datasets
 print("\nSaving datasets...")
 products_df.to_csv('products.csv', index=False)
 customers_df.to_csv('customers.csv', index=False)
 orders_df.to_csv('orders.csv', index=False)
+order_items_df.to_csv('order_items.csv', index=False)
 payments_df.to_csv('payments.csv', index=False)
+stores_df.to_csv('stores.csv', index=False)
 
 print(f"\n✓ Generated {len(products_df)} products")
 print(f"✓ Generated {len(customers_df)} customers")
 print(f"✓ Generated {len(orders_df)} orders")
+print(f"✓ Generated {len(order_items_df)} order items")
 print(f"✓ Generated {len(payments_df)} payment records")
+print(f"✓ Generated {len(stores_df)} stores")
 
 print("\nDataset Summary:")
 print(f"Date Range: {orders_df['order_date'].min()} to {orders_df['order_date'].max()}")
@@ -232,4 +246,6 @@ print("\nFiles saved:")
 print("- products.csv")
 print("- customers.csv")
 print("- orders.csv")
-print("- payments.csv")
\ No newline at end of file
+print("- order_items.csv")
+print("- payments.csv")
+print("- stores.csv")
\ No newline at end of file
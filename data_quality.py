@@ -0,0 +1,362 @@
+"""
+Blinkit Sales Performance Analytics - Data Quality Profiler
+Streams each table once in chunks to build per-column profiles, detect
+duplicate keys/rows and check referential integrity, then applies a
+pass/fail gate for the pipeline
+
+- Column profiles: null counts, min/max and HyperLogLog distinct estimates
+- Duplicate keys: exact, from the 64-bit key hashes kept for every table
+- Duplicate rows: row hashes checked against a Bloom filter that persists
+  across chunks/partitions; reported as an estimate (may include rare false
+  positives) and not part of the gate
+- Foreign keys: child key hashes looked up in the sorted parent key hashes
+
+Usage:
+    python data_quality.py                      # Datasets/ schema
+    python data_quality.py --schema generated   # data_generation.py output
+Exit code is 1 when the quality gate fails.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+CHUNK_ROWS = 250_000
+BLOOM_CAPACITY = 10_000_000
+BLOOM_FP_RATE = 0.001
+HLL_PRECISION = 14
+
+# Table name -> (file, primary key columns); parents must be listed before children
+SCHEMAS = {
+    'datasets': {
+        'directory': 'Datasets',
+        'tables': {
+            'customers': ('blinkit_customers.csv', ['customer_id']),
+            'products': ('blinkit_products.csv', ['product_id']),
+            'stores': ('blinkit_stores.csv', ['store_id']),
+            'orders': ('blinkit_orders.csv', ['order_id']),
+            'order_items': ('blinkit_order_items.csv', ['order_id', 'product_id']),
+            'customer_feedback': ('blinkit_customer_feedback.csv', ['feedback_id']),
+            'delivery_performance': ('blinkit_delivery_performance.csv', ['order_id']),
+        },
+        # (child table, child column, parent table, parent column)
+        'foreign_keys': [
+            ('orders', 'customer_id', 'customers', 'customer_id'),
+            ('orders', 'store_id', 'stores', 'store_id'),
+            ('order_items', 'order_id', 'orders', 'order_id'),
+            ('order_items', 'product_id', 'products', 'product_id'),
+            ('customer_feedback', 'order_id', 'orders', 'order_id'),
+            ('delivery_performance', 'order_id', 'orders', 'order_id'),
+        ],
+    },
+    'generated': {
+        'directory': '.',
+        'tables': {
+            'products': ('products.csv', ['product_id']),
+            'customers': ('customers.csv', ['customer_id']),
+            'stores': ('stores.csv', ['store_id']),
+            'orders': ('orders.csv', ['order_id']),
+            'order_items': ('order_items.csv', ['order_id', 'product_id']),
+            'payments': ('payments.csv', ['order_id']),
+        },
+        'foreign_keys': [
+            ('orders', 'customer_id', 'customers', 'customer_id'),
+            ('orders', 'store_id', 'stores', 'store_id'),
+            ('order_items', 'order_id', 'orders', 'order_id'),
+            ('order_items', 'product_id', 'products', 'product_id'),
+            ('payments', 'order_id', 'orders', 'order_id'),
+        ],
+    },
+}
+
+
+class BloomFilter:
+    """Bit-packed Bloom filter over 64-bit hashes (double hashing for k probes)."""
+
+    def __init__(self, capacity=BLOOM_CAPACITY, fp_rate=BLOOM_FP_RATE):
+        self.n_bits = max(64, int(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes):
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        probes = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + probes * h2[:, None]) % np.uint64(self.n_bits)
+
+    def check_and_add(self, hashes):
+        """Return a mask of hashes that were (probably) already present, then add them all."""
+        positions = self._positions(hashes)
+        byte_idx, bit_mask = positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8)
+        seen = np.all(self.bits[byte_idx] & bit_mask, axis=1)
+        np.bitwise_or.at(self.bits, byte_idx.ravel(), bit_mask.ravel())
+        self.count += len(hashes)
+        return seen
+
+    def false_positive_rate(self):
+        return (1 - math.exp(-self.n_hashes * self.count / self.n_bits)) ** self.n_hashes
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch over 64-bit hashes."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes << np.uint64(p)
+        # Leading zeros of the remaining bits via the float exponent (bit length)
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = np.clip(65 - bit_length, 1, 64 - p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def estimate(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def _normalize(values):
+    """Make hashes independent of per-chunk dtype drift (5 vs 5.0 once a chunk has nulls)."""
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype(np.float64)
+    return values
+
+
+def hash_rows(frame):
+    """64-bit hash per row over the given columns."""
+    frame = frame.apply(_normalize)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(np.uint64)
+
+
+class TableProfiler:
+    """Accumulates profile, duplicate and key statistics for one table across chunks."""
+
+    def __init__(self, name, key_columns, bloom_capacity=BLOOM_CAPACITY):
+        self.name = name
+        self.key_columns = key_columns
+        self.rows = 0
+        self.columns = {}
+        self.row_bloom = BloomFilter(bloom_capacity)
+        self.duplicate_rows = 0
+        self.null_keys = 0
+        self.key_hashes = []
+        self._sorted_keys = None
+        self.fk_hashes = {}
+
+    def _profile_column(self, column, values):
+        stats = self.columns.setdefault(column, {'nulls': 0, 'min': None, 'max': None,
+                                                 'hll': HyperLogLog()})
+        present = values.dropna()
+        stats['nulls'] += len(values) - len(present)
+        if present.empty:
+            return
+        stats['hll'].add(pd.util.hash_pandas_object(_normalize(present), index=False).to_numpy(np.uint64))
+        if not pd.api.types.is_numeric_dtype(present):
+            present = present.astype(str)
+        lo, hi = present.min(), present.max()
+        lo, hi = getattr(lo, 'item', lambda: lo)(), getattr(hi, 'item', lambda: hi)()
+        stats['min'] = lo if stats['min'] is None else min(stats['min'], lo)
+        stats['max'] = hi if stats['max'] is None else max(stats['max'], hi)
+
+    def _count_duplicates(self, bloom, hashes):
+        within_chunk = pd.Series(hashes).duplicated().to_numpy()
+        seen_before = bloom.check_and_add(hashes[~within_chunk])
+        return int(within_chunk.sum() + seen_before.sum())
+
+    def add_chunk(self, chunk, fk_columns=()):
+        self.rows += len(chunk)
+        for column in chunk.columns:
+            self._profile_column(column, chunk[column])
+
+        self.duplicate_rows += self._count_duplicates(self.row_bloom, hash_rows(chunk))
+
+        keys = chunk[self.key_columns]
+        key_present = keys.notna().all(axis=1).to_numpy()
+        self.null_keys += int((~key_present).sum())
+        self.key_hashes.append(hash_rows(keys[key_present]))
+        self._sorted_keys = None
+
+        for column in fk_columns:
+            fk = chunk[[column]].dropna()
+            self.fk_hashes.setdefault(column, []).append((hash_rows(fk), fk[column].to_numpy()))
+
+    def release_filters(self):
+        """Drop the Bloom filter once the table has been fully streamed."""
+        self.row_bloom = None
+
+    def sorted_key_hashes(self):
+        if self._sorted_keys is None:
+            hashes = np.concatenate(self.key_hashes) if self.key_hashes else np.empty(0, dtype=np.uint64)
+            self._sorted_keys = np.unique(hashes)
+        return self._sorted_keys
+
+    def duplicate_keys(self):
+        """Exact count of non-null keys repeating an earlier key."""
+        return sum(len(h) for h in self.key_hashes) - len(self.sorted_key_hashes())
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'key_columns': self.key_columns,
+            'null_keys': self.null_keys,
+            'duplicate_keys': self.duplicate_keys(),
+            'duplicate_rows_estimate': self.duplicate_rows,
+            'bloom_false_positive_rate': self.row_bloom.false_positive_rate(),
+            'columns': {
+                column: {
+                    'nulls': stats['nulls'],
+                    'null_rate': round(stats['nulls'] / self.rows, 4) if self.rows else 0.0,
+                    'distinct_estimate': stats['hll'].estimate(),
+                    'min': stats['min'],
+                    'max': stats['max'],
+                }
+                for column, stats in self.columns.items()
+            },
+        }
+
+
+def check_foreign_key(child, column, parent_hashes, sample_size=5):
+    """Vectorized lookup of child FK hashes in the sorted parent key hashes."""
+    orphans, checked, samples = 0, 0, []
+    for hashes, values in child.fk_hashes.get(column, []):
+        pos = np.searchsorted(parent_hashes, hashes)
+        found = (pos < len(parent_hashes)) & (parent_hashes[np.minimum(pos, len(parent_hashes) - 1)] == hashes)
+        checked += len(hashes)
+        orphans += int((~found).sum())
+        if len(samples) < sample_size:
+            samples.extend(values[~found][:sample_size - len(samples)].tolist())
+    return {
+        'checked': checked,
+        'orphans': orphans,
+        'orphan_rate': round(orphans / checked, 4) if checked else 0.0,
+        'orphan_samples': samples,
+    }
+
+
+def run_quality_checks(schema_name='datasets', data_dir=None, chunk_rows=CHUNK_ROWS,
+                       bloom_capacity=BLOOM_CAPACITY, max_orphan_rate=0.0, verbose=True):
+    """Profile every table in the schema once and evaluate the quality gate."""
+    log = print if verbose else (lambda *args: None)
+    schema = SCHEMAS[schema_name]
+    data_dir = schema['directory'] if data_dir is None else data_dir
+    fk_columns = {}
+    for child, column, _, _ in schema['foreign_keys']:
+        fk_columns.setdefault(child, []).append(column)
+
+    profilers, tables = {}, {}
+    for name, (filename, key_columns) in schema['tables'].items():
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            log(f"  - {name}: {filename} not found, skipped")
+            continue
+        start = time.perf_counter()
+        profiler = TableProfiler(name, key_columns, bloom_capacity)
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            profiler.add_chunk(chunk, fk_columns.get(name, ()))
+        profilers[name] = profiler
+        tables[name] = profiler.report()
+        profiler.release_filters()
+        log(f"  ✓ {name}: {profiler.rows:,} rows in {time.perf_counter() - start:.2f}s")
+
+    foreign_keys = []
+    for child, column, parent, parent_column in schema['foreign_keys']:
+        entry = {'child': f'{child}.{column}', 'parent': f'{parent}.{parent_column}'}
+        if child not in profilers or parent not in profilers:
+            entry['status'] = 'skipped (table missing)'
+        else:
+            entry.update(check_foreign_key(profilers[child], column, profilers[parent].sorted_key_hashes()))
+            # Compare the raw share: the rounded orphan_rate hides a handful of orphans in large tables
+            entry['status'] = 'fail' if entry['orphans'] > max_orphan_rate * entry['checked'] else 'ok'
+        foreign_keys.append(entry)
+
+    failures = []
+    for name, table in tables.items():
+        if table['null_keys']:
+            failures.append(f"{name}: {table['null_keys']:,} rows with null key")
+        if table['duplicate_keys']:
+            failures.append(f"{name}: {table['duplicate_keys']:,} duplicate keys")
+    skipped = []
+    for entry in foreign_keys:
+        if entry['status'] == 'fail':
+            failures.append(f"{entry['child']} -> {entry['parent']}: "
+                            f"{entry['orphans']:,} orphans ({entry['orphans'] / entry['checked']:.4%})")
+        elif entry['status'] != 'ok':
+            skipped.append(f"{entry['child']} -> {entry['parent']}: {entry['status']}")
+
+    return {
+        'schema': schema_name,
+        'tables': tables,
+        'foreign_keys': foreign_keys,
+        'gate': {'passed': not failures, 'failures': failures, 'skipped': skipped},
+    }
+
+
+def print_report(report):
+    print("\nNull Values / Duplicates:")
+    for name, table in report['tables'].items():
+        nulls = sum(col['nulls'] for col in table['columns'].values())
+        print(f"  {name}: {nulls} nulls, ~{table['duplicate_rows_estimate']} duplicate rows, "
+              f"{table['duplicate_keys']} duplicate keys ({'+'.join(table['key_columns'])})")
+
+    print("\nReferential Integrity:")
+    for entry in report['foreign_keys']:
+        detail = (f"{entry['orphans']:,}/{entry['checked']:,} orphans"
+                  if 'orphans' in entry else entry['status'])
+        print(f"  {entry['child']} -> {entry['parent']}: {detail}")
+
+    gate = report['gate']
+    skipped = f" ({len(gate['skipped'])} check(s) skipped)" if gate['skipped'] else ''
+    print(f"\nQuality Gate: {'PASSED' if gate['passed'] else 'FAILED'}{skipped}")
+    for failure in gate['failures']:
+        print(f"  ✗ {failure}")
+    for check in gate['skipped']:
+        print(f"  - not checked: {check}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming data-quality profiler and gate')
+    parser.add_argument('--schema', choices=sorted(SCHEMAS), default='datasets')
+    parser.add_argument('--data-dir', default=None, help='override the schema directory')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--bloom-capacity', type=int, default=BLOOM_CAPACITY,
+                        help='expected rows per table for Bloom filter sizing')
+    parser.add_argument('--max-orphan-rate', type=float, default=0.0,
+                        help='allowed share of FK values without a parent (default: 0)')
+    parser.add_argument('-o', '--output', default='data_quality_report.json')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("DATA QUALITY PROFILE")
+    print("="*70)
+    print(f"\n[1] Streaming tables ({args.schema} schema)...")
+
+    report = run_quality_checks(args.schema, args.data_dir, args.chunk_rows,
+                                args.bloom_capacity, args.max_orphan_rate)
+    print_report(report)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\n✓ Saved: {args.output}")
+    print("\n" + "="*70)
+
+    sys.exit(0 if report['gate']['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Blinkit Sales Performance Analytics - Discount What-If Simulator
+Monte Carlo evaluation of alternative discount tier schedules on revenue,
+profit and margin per city and category
+
+Each schedule mirrors the policy in data_generation.py: two basket-value
+thresholds split orders into three tiers, and each order draws one discount
+rate uniformly from its tier's [low, high) range, applied to the whole basket.
+An optional linear demand elasticity scales each order's volume by
+1 + elasticity x (discount - baseline expected discount); at the default of 0
+volumes are held fixed. Lines are pre-summed into (order, city x category)
+segments and all scenarios are evaluated as (scenario x draw x segment)
+arrays, chunked over scenarios and draws to bound memory and spread over a
+process pool.
+
+Usage:
+    python discount_simulator.py --scenarios 2000 --draws 200 --workers 4
+    python discount_simulator.py --schedules my_schedules.csv --elasticity 2.0
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+# Current policy from data_generation.py (scenario 0 in every run)
+BASELINE_SCHEDULE = {
+    'threshold_1': 200.0, 'threshold_2': 500.0,
+    'tier1_low': 0.00, 'tier1_high': 0.05,
+    'tier2_low': 0.05, 'tier2_high': 0.15,
+    'tier3_low': 0.10, 'tier3_high': 0.25,
+}
+SCHEDULE_COLUMNS = list(BASELINE_SCHEDULE)
+
+# Upper bound on float64 cells held per chunk (~160 MB per working array);
+# a single draw over all segments is the smallest chunk
+MAX_CHUNK_CELLS = 20_000_000
+MAX_WORKERS = 8
+PERCENTILES = (5, 50, 95)
+
+# Read-only line arrays, installed once per worker process
+_LINES = None
+
+
+def load_order_lines():
+    """Per-order basket values and (order, city x category) segments sorted by group.
+
+    Orders are tiered on their basket value (sum of line selling prices), as in
+    data_generation.py; the master order_value column is zeroed for cancelled
+    and returned orders, so it can't be used for tiering.
+    """
+    lines = pd.read_csv('blinkit_detailed_data.csv',
+                        usecols=['order_id', 'city', 'category', 'selling_price', 'cost_price'])
+    lines = lines.dropna(subset=['category'])
+
+    order_codes, _ = pd.factorize(lines['order_id'])
+    basket_value = np.bincount(order_codes, weights=lines['selling_price'].to_numpy(np.float64))
+
+    # One segment per (order, group): an order's discount applies to all of its lines
+    group_codes, group_index = pd.MultiIndex.from_frame(lines[['city', 'category']]).factorize(sort=True)
+    segments = pd.DataFrame({'group': group_codes, 'order': order_codes,
+                             'price': lines['selling_price'].to_numpy(np.float64),
+                             'cost': lines['cost_price'].to_numpy(np.float64)})
+    segments = segments.groupby(['group', 'order'], sort=True).sum().reset_index()
+    segment_groups = segments['group'].to_numpy()
+
+    # Expected discount under the current policy (tier midpoint), for elasticity
+    baseline = np.array([BASELINE_SCHEDULE[c] for c in SCHEDULE_COLUMNS])
+    baseline_tier = ((basket_value >= baseline[0]).astype(np.int8) + (basket_value >= baseline[1]))
+    tier_midpoints = (baseline[[2, 4, 6]] + baseline[[3, 5, 7]]) / 2
+
+    return {
+        'order_value': basket_value,
+        'baseline_discount': tier_midpoints[baseline_tier],
+        'segment_order': segments['order'].to_numpy(),
+        'price': segments['price'].to_numpy(),
+        'line_cost': segments['cost'].to_numpy(),
+        'group_starts': np.flatnonzero(np.r_[True, segment_groups[1:] != segment_groups[:-1]]),
+        'gross': np.bincount(segment_groups, weights=segments['price'].to_numpy()),
+        'cost': np.bincount(segment_groups, weights=segments['cost'].to_numpy()),
+        'n_lines': len(lines),
+    }, group_index
+
+
+def random_schedules(n, rng):
+    """Sample n plausible tier schedules (thresholds increasing, ranges non-empty)."""
+    thresholds = np.sort(rng.uniform(100, 1000, size=(n, 2)), axis=1).round(-1)
+    lows = np.sort(rng.uniform(0.0, 0.20, size=(n, 3)), axis=1)
+    widths = rng.uniform(0.0, 0.10, size=(n, 3))
+    schedules = pd.DataFrame({
+        'threshold_1': thresholds[:, 0], 'threshold_2': thresholds[:, 1],
+        'tier1_low': lows[:, 0], 'tier1_high': lows[:, 0] + widths[:, 0],
+        'tier2_low': lows[:, 1], 'tier2_high': lows[:, 1] + widths[:, 1],
+        'tier3_low': lows[:, 2], 'tier3_high': lows[:, 2] + widths[:, 2],
+    }).round(4)
+    return pd.concat([pd.DataFrame([BASELINE_SCHEDULE]), schedules], ignore_index=True)
+
+
+def _init_worker(lines):
+    global _LINES
+    _LINES = lines
+
+
+def _simulate_chunk(schedules, n_draws, seed, elasticity=0.0):
+    """Evaluate a block of scenarios x draws; returns per-draw group revenue and profit.
+
+    schedules is a (k, 8) array in SCHEDULE_COLUMNS order.
+    """
+    lines = _LINES
+    value, price, starts = lines['order_value'], lines['price'], lines['group_starts']
+    gross, cost = lines['gross'], lines['cost']
+    rng = np.random.default_rng(seed)
+
+    # Tier per (scenario, order): 0, 1 or 2
+    tier = ((value[None, :] >= schedules[:, [0]]).astype(np.int8)
+            + (value[None, :] >= schedules[:, [1]]))
+    low = np.take_along_axis(schedules[:, [2, 4, 6]], tier, axis=1)
+    span = np.take_along_axis(schedules[:, [3, 5, 7]], tier, axis=1) - low
+    del tier
+
+    # One discount rate per (scenario, draw, order), spread to the order's segments
+    d = rng.random((len(schedules), n_draws, len(value)))
+    d *= span[:, None, :]
+    d += low[:, None, :]
+    if elasticity:
+        volume = np.maximum(1 + elasticity * (d - lines['baseline_discount']), 0)
+        volume = volume[:, :, lines['segment_order']]
+    d = d[:, :, lines['segment_order']]
+
+    if elasticity:
+        revenue = np.add.reduceat(price * (1 - d) * volume, starts, axis=2)
+        cost = np.add.reduceat(lines['line_cost'] * volume, starts, axis=2)
+        del volume
+    else:
+        # Fixed volumes: only the discount amount varies, group sums of gross/cost are constant
+        d *= price
+        revenue = gross - np.add.reduceat(d, starts, axis=2)
+    del d
+
+    return revenue, revenue - cost                      # (k, draws, groups) each
+
+
+def run_simulation(lines, schedules, n_draws=100, workers=1, seed=42, elasticity=0.0):
+    """Run every schedule; returns (per-draw totals, per-group stats) arrays."""
+    params = schedules[SCHEDULE_COLUMNS].to_numpy(np.float64)
+    n_scenarios, n_segments = len(params), len(lines['price'])
+
+    # Chunk over draws when a single scenario already exceeds the cell budget
+    draw_chunk = max(1, min(n_draws, MAX_CHUNK_CELLS // n_segments))
+    scenario_chunk = max(1, MAX_CHUNK_CELLS // (draw_chunk * n_segments)) if draw_chunk == n_draws else 1
+    bounds = [(a, min(a + scenario_chunk, n_scenarios), b, min(b + draw_chunk, n_draws))
+              for a in range(0, n_scenarios, scenario_chunk) for b in range(0, n_draws, draw_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    print(f"  {n_scenarios:,} scenarios x {n_draws:,} draws x {lines['n_lines']:,} lines "
+          f"({len(lines['order_value']):,} orders, {n_segments:,} order x group segments)")
+    print(f"  {len(bounds):,} chunks of <= {scenario_chunk:,} scenarios x {draw_chunk:,} draws")
+
+    n_groups = len(lines['gross'])
+    totals = np.empty((2, n_scenarios, n_draws))
+    group_stats = {key: np.empty((n_scenarios, n_groups))
+                   for key in ('revenue_mean', 'profit_mean', 'profit_p05', 'profit_p95')}
+
+    def reduce(a, b, revenue, profit):
+        totals[0, a:b], totals[1, a:b] = revenue.sum(axis=2), profit.sum(axis=2)
+        group_stats['revenue_mean'][a:b] = revenue.mean(axis=1)
+        group_stats['profit_mean'][a:b] = profit.mean(axis=1)
+        group_stats['profit_p05'][a:b], group_stats['profit_p95'][a:b] = np.percentile(profit, [5, 95], axis=1)
+
+    def collect(results):
+        # Chunks holding every draw are reduced as they arrive; a scenario split over
+        # draw chunks (one scenario per chunk) is buffered until its last draw block
+        for (a, b, d0, d1), (chunk_revenue, chunk_profit) in zip(bounds, results):
+            if d0 == 0 and d1 == n_draws:
+                reduce(a, b, chunk_revenue, chunk_profit)
+                continue
+            if d0 == 0:
+                revenue = np.empty((b - a, n_draws, n_groups))
+                profit = np.empty((b - a, n_draws, n_groups))
+            revenue[:, d0:d1], profit[:, d0:d1] = chunk_revenue, chunk_profit
+            if d1 == n_draws:
+                reduce(a, b, revenue, profit)
+
+    tasks = [(params[a:b], d1 - d0, s, elasticity) for (a, b, d0, d1), s in zip(bounds, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(lines,)) as pool:
+            collect(pool.map(_simulate_chunk, *zip(*tasks)))
+    else:
+        _init_worker(lines)
+        collect(_simulate_chunk(*task) for task in tasks)
+    return totals, group_stats                          # totals: (2, scenarios, draws)
+
+
+def summarize(schedules, totals, group_stats, group_index):
+    """Scenario-level outcome distributions and a long (scenario, city, category) table."""
+    revenue, profit = totals
+    margin = profit / revenue * 100
+
+    outcomes = {}
+    for name, values in [('revenue', revenue), ('profit', profit), ('margin_pct', margin)]:
+        outcomes[f'{name}_mean'] = values.mean(axis=1)
+        for q, col in zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=1)):
+            outcomes[f'{name}_p{q:02d}'] = col
+    outcomes = pd.DataFrame(outcomes)
+    outcomes['profit_vs_baseline'] = outcomes['profit_mean'] - outcomes.loc[0, 'profit_mean']
+
+    summary = pd.concat([schedules[SCHEDULE_COLUMNS].reset_index(drop=True), outcomes.round(2)], axis=1)
+    summary.insert(0, 'scenario', np.arange(len(summary)))
+
+    n_scenarios, n_groups = group_stats['profit_mean'].shape
+    by_group = pd.DataFrame({
+        'scenario': np.repeat(np.arange(n_scenarios), n_groups),
+        'city': np.tile(group_index.get_level_values(0), n_scenarios),
+        'category': np.tile(group_index.get_level_values(1), n_scenarios),
+        **{key: values.ravel() for key, values in group_stats.items()},
+    })
+    by_group['margin_pct_mean'] = by_group['profit_mean'] / by_group['revenue_mean'] * 100
+    return summary, by_group.round(2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Monte Carlo discount schedule simulator')
+    parser.add_argument('-n', '--scenarios', type=int, default=1000,
+                        help='random schedules to evaluate besides the baseline (default: 1000)')
+    parser.add_argument('--schedules', default=None,
+                        help=f'CSV of schedules with columns {", ".join(SCHEDULE_COLUMNS)}')
+    parser.add_argument('-d', '--draws', type=int, default=100,
+                        help='Monte Carlo draws per scenario (default: 100)')
+    parser.add_argument('-e', '--elasticity', type=float, default=0.0,
+                        help='volume change per unit of extra discount vs the current policy (default: 0)')
+    parser.add_argument('-w', '--workers', type=int, default=min(MAX_WORKERS, os.cpu_count() or 1))
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("="*70)
+    print("DISCOUNT WHAT-IF SIMULATION")
+    print("="*70)
+
+    print("\n[1] Loading order lines...")
+    lines, group_index = load_order_lines()
+    print(f"✓ {lines['n_lines']:,} lines, {len(lines['order_value']):,} orders "
+          f"in {len(group_index)} city x category groups")
+
+    print("\n[2] Preparing discount schedules...")
+    if args.schedules:
+        schedules = pd.concat([pd.DataFrame([BASELINE_SCHEDULE]),
+                               pd.read_csv(args.schedules)[SCHEDULE_COLUMNS]], ignore_index=True)
+    else:
+        schedules = random_schedules(args.scenarios, np.random.default_rng(args.seed))
+    print(f"✓ {len(schedules):,} schedules (scenario 0 = current policy)")
+
+    print(f"\n[3] Simulating on {args.workers} worker(s)...")
+    start = time.perf_counter()
+    totals, group_stats = run_simulation(lines, schedules, args.draws, max(1, args.workers), args.seed,
+                                         args.elasticity)
+    elapsed = time.perf_counter() - start
+    print(f"✓ Done in {elapsed:.1f}s ({len(schedules) * args.draws / elapsed:,.0f} scenario-draws/s)")
+
+    summary, by_group = summarize(schedules, totals, group_stats, group_index)
+    summary.to_csv('discount_scenarios.csv', index=False)
+    by_group.to_csv('discount_scenarios_by_group.csv', index=False)
+    print("\n✓ Saved: discount_scenarios.csv, discount_scenarios_by_group.csv")
+
+    print("\nTop 5 Schedules by Expected Profit:")
+    cols = ['scenario'] + SCHEDULE_COLUMNS + ['profit_mean', 'profit_p05', 'margin_pct_mean', 'profit_vs_baseline']
+    print(summary.sort_values('profit_mean', ascending=False).head(5)[cols].to_string(index=False))
+    print("\nBaseline (current policy):")
+    print(summary.loc[[0], cols].to_string(index=False))
+
+    print("\n" + "="*70)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,306 +1,432 @@
 """
 Blinkit Sales Performance Analytics - Excel Report Generation
 Creates management-ready Excel reports with pivot tables and conditional formatting
+
+Usage:
+    python excel_report_structure.py                    # national report
+    python excel_report_structure.py --by city          # one workbook per city
+    python excel_report_structure.py --by store -w 4    # one workbook per store, 4 workers
 """
 
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.formatting.rule import ColorScaleRule, DataBarRule, CellIsRule
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*70)
-print("GENERATING EXCEL MANAGEMENT REPORT")
-print("="*70)
-
-# Load cleaned data
-df = pd.read_csv('blinkit_master_data.csv')
-df_detailed = pd.read_csv('blinkit_detailed_data.csv')
-
-# Ensure datetime
-df['order_date'] = pd.to_datetime(df['order_date'])
-df['month'] = df['order_date'].dt.to_period('M').astype(str)
-
-# Create Excel writer
-excel_file = 'Blinkit_Management_Report.xlsx'
-writer = pd.ExcelWriter(excel_file, engine='openpyxl')
-
-# ============================================================================
-# SHEET 1: EXECUTIVE SUMMARY
-# ============================================================================
-print("\n[1] Creating Executive Summary...")
-
-summary_data = {
-    'Metric': [
-        'Total Revenue (₹)',
-        'Total Profit (₹)',
-        'Overall Profit Margin (%)',
-        'Total Orders',
-        'Delivered Orders',
-        'Cancelled Orders (%)',
-        'Avg Order Value (₹)',
-        'Avg Delivery Time (min)',
-        'SLA Breach Rate (%)',
-        'Repeat Customer Rate (%)',
-        'Avg Discount (%)'
-    ],
-    'Value': [
-        f"{df['revenue'].sum():,.0f}",
-        f"{df['profit'].sum():,.0f}",
-        f"{(df['profit'].sum() / df['revenue'].sum() * 100):.2f}",
-        f"{len(df):,}",
-        f"{len(df[df['order_status']=='Delivered']):,}",
-        f"{(len(df[df['order_status']=='Cancelled']) / len(df) * 100):.2f}",
-        f"{df['revenue'].mean():,.2f}",
-        f"{df['delivery_time_minutes'].mean():.1f}",
-        f"{(df['delivery_sla_breach'].mean() * 100):.2f}",
-        f"{(df['repeat_customer_flag'].mean() * 100):.2f}",
-        f"{((df['discount_amount'] / (df['revenue'] + df['discount_amount'])) * 100).mean():.2f}"
-    ]
-}
-summary_df = pd.DataFrame(summary_data)
-summary_df.to_excel(writer, sheet_name='Executive Summary', index=False)
-
-# ============================================================================
-# SHEET 2: CITY PERFORMANCE
-# ============================================================================
-print("[2] Creating City Performance Analysis...")
-
-city_perf = df.groupby('city').agg({
-    'revenue': 'sum',
-    'profit': 'sum',
-    'order_id': 'count',
-    'delivery_time_minutes': 'mean',
-    'delivery_sla_breach': 'mean',
-    'repeat_customer_flag': 'mean'
-}).round(2)
-
-city_perf.columns = ['Revenue', 'Profit', 'Orders', 'Avg_Delivery_Time', 
-                     'SLA_Breach_Rate', 'Repeat_Customer_Rate']
-city_perf['Profit_Margin_%'] = (city_perf['Profit'] / city_perf['Revenue'] * 100).round(2)
-city_perf['Revenue_Per_Order'] = (city_perf['Revenue'] / city_perf['Orders']).round(2)
-city_perf = city_perf.sort_values('Profit', ascending=False).reset_index()
-
-city_perf.to_excel(writer, sheet_name='City Performance', index=False)
-
-# ============================================================================
-# SHEET 3: CATEGORY ANALYSIS
-# ============================================================================
-print("[3] Creating Category Analysis...")
-
-category_perf = df_detailed.groupby('category').agg({
-    'selling_price': 'sum',
-    'profit': 'sum',
-    'order_id': 'nunique'
-}).round(2)
-
-category_perf.columns = ['Revenue', 'Profit', 'Orders']
-category_perf['Profit_Margin_%'] = (category_perf['Profit'] / category_perf['Revenue'] * 100).round(2)
-category_perf['Avg_Order_Value'] = (category_perf['Revenue'] / category_perf['Orders']).round(2)
-category_perf = category_perf.sort_values('Revenue', ascending=False).reset_index()
-
-category_perf.to_excel(writer, sheet_name='Category Analysis', index=False)
-
-# ============================================================================
-# SHEET 4: MONTHLY TRENDS
-# ============================================================================
-print("[4] Creating Monthly Trends...")
-
-monthly_trends = df.groupby('month').agg({
-    'revenue': 'sum',
-    'profit': 'sum',
-    'order_id': 'count',
-    'delivery_time_minutes': 'mean'
-}).round(2)
-
-monthly_trends.columns = ['Revenue', 'Profit', 'Orders', 'Avg_Delivery_Time']
-monthly_trends['Profit_Margin_%'] = (monthly_trends['Profit'] / monthly_trends['Revenue'] * 100).round(2)
-monthly_trends['Revenue_Growth_%'] = monthly_trends['Revenue'].pct_change() * 100
-monthly_trends['Order_Growth_%'] = monthly_trends['Orders'].pct_change() * 100
-monthly_trends = monthly_trends.round(2).reset_index()
-
-monthly_trends.to_excel(writer, sheet_name='Monthly Trends', index=False)
-
-# ============================================================================
-# SHEET 5: DISCOUNT ANALYSIS
-# ============================================================================
-print("[5] Creating Discount Analysis...")
-
-df['discount_pct'] = (df['discount_amount'] / (df['revenue'] + df['discount_amount']) * 100).round(2)
-df['discount_bucket'] = pd.cut(df['discount_pct'], 
-                                bins=[0, 5, 10, 15, 100], 
-                                labels=['0-5%', '5-10%', '10-15%', '>15%'])
-
-discount_analysis = df.groupby('discount_bucket').agg({
-    'profit_margin_pct': 'mean',
-    'revenue': 'sum',
-    'profit': 'sum',
-    'order_id': 'count'
-}).round(2)
-
-discount_analysis.columns = ['Avg_Profit_Margin_%', 'Total_Revenue', 'Total_Profit', 'Orders']
-discount_analysis['Revenue_Per_Order'] = (discount_analysis['Total_Revenue'] / discount_analysis['Orders']).round(2)
-discount_analysis = discount_analysis.reset_index()
-
-discount_analysis.to_excel(writer, sheet_name='Discount Analysis', index=False)
-
-# ============================================================================
-# SHEET 6: LOSS-MAKING PRODUCTS
-# ============================================================================
-print("[6] Identifying Loss-Making Products...")
-
-product_performance = df_detailed.groupby(['product_id', 'category', 'city']).agg({
-    'selling_price': 'sum',
-    'cost_price': 'sum',
-    'profit': 'sum',
-    'order_id': 'count'
-}).reset_index()
-
-product_performance.columns = ['Product_ID', 'Category', 'City', 'Revenue', 
-                               'Cost', 'Profit', 'Orders']
-product_performance['Profit_Margin_%'] = (product_performance['Profit'] / 
-                                          product_performance['Revenue'] * 100).round(2)
-
-loss_makers = product_performance[product_performance['Profit'] < 0].sort_values('Profit')
-loss_makers.to_excel(writer, sheet_name='Loss-Making Products', index=False)
-
-# ============================================================================
-# SHEET 7: DELIVERY PERFORMANCE
-# ============================================================================
-print("[7] Creating Delivery Performance Report...")
-
-delivery_perf = df.groupby(['city', 'delivery_sla_breach']).agg({
-    'order_id': 'count',
-    'delivery_time_minutes': 'mean',
-    'repeat_customer_flag': 'mean'
-}).round(2)
-
-delivery_perf.columns = ['Orders', 'Avg_Delivery_Time', 'Repeat_Customer_Rate']
-delivery_perf = delivery_perf.reset_index()
-delivery_perf['SLA_Status'] = delivery_perf['delivery_sla_breach'].map({0: 'On-Time', 1: 'Delayed'})
-delivery_perf = delivery_perf[['city', 'SLA_Status', 'Orders', 'Avg_Delivery_Time', 'Repeat_Customer_Rate']]
-
-delivery_perf.to_excel(writer, sheet_name='Delivery Performance', index=False)
-
-# ============================================================================
-# SHEET 8: PEAK HOURS ANALYSIS
-# ============================================================================
-print("[8] Creating Peak Hours Analysis...")
-
-df['hour'] = df['order_time'].str.split(':').str[0].astype(int)
-
-hourly_analysis = df.groupby('hour').agg({
-    'order_id': 'count',
-    'delivery_time_minutes': 'mean',
-    'delivery_sla_breach': 'mean',
-    'revenue': 'sum'
-}).round(2)
-
-hourly_analysis.columns = ['Orders', 'Avg_Delivery_Time', 'SLA_Breach_Rate', 'Revenue']
-hourly_analysis['Revenue_Per_Order'] = (hourly_analysis['Revenue'] / hourly_analysis['Orders']).round(2)
-hourly_analysis = hourly_analysis.reset_index()
-
-hourly_analysis.to_excel(writer, sheet_name='Peak Hours', index=False)
-
-# Save Excel file
-writer.close()
-
-# ============================================================================
-# APPLY FORMATTING (using openpyxl)
-# ============================================================================
-print("\n[9] Applying conditional formatting...")
-
-from openpyxl import load_workbook
-
-wb = load_workbook(excel_file)
-
-# Format Executive Summary
-ws = wb['Executive Summary']
-ws.column_dimensions['A'].width = 30
-ws.column_dimensions['B'].width = 20
+from group_ops import top_loss_makers, product_rfm_segments, LOSS_MAKERS_PER_CITY
+
+EXCEL_FILE = 'Blinkit_Management_Report.xlsx'
+
+# Batch mode: scope name -> column in the master data
+BATCH_SCOPES = {'city': 'city', 'store': 'store_id'}
+MAX_WORKERS = 8
 
 # Header formatting
 header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
 header_font = Font(bold=True, color="FFFFFF", size=12)
 
-for cell in ws[1]:
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.alignment = Alignment(horizontal='center', vertical='center')
-
-# Format City Performance with conditional formatting
-ws = wb['City Performance']
-
-# Set column widths
-for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
-    ws.column_dimensions[col].width = 15
-
-# Apply headers
-for cell in ws[1]:
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.alignment = Alignment(horizontal='center')
-
-# Profit Margin heatmap (Column H)
-ws.conditional_formatting.add(f'H2:H{len(city_perf)+1}',
-    ColorScaleRule(start_type='min', start_color='F8696B',
-                   mid_type='percentile', mid_value=50, mid_color='FFEB84',
-                   end_type='max', end_color='63BE7B'))
-
-# Revenue bar chart (Column B)
-ws.conditional_formatting.add(f'B2:B{len(city_perf)+1}',
-    DataBarRule(start_type='min', start_value=0, end_type='max',
-                color="5A8AC6", showValue=True))
-
-# Format Category Analysis
-ws = wb['Category Analysis']
-for col in ['A', 'B', 'C', 'D', 'E', 'F']:
-    ws.column_dimensions[col].width = 20
-
-for cell in ws[1]:
-    cell.fill = header_fill
-    cell.font = header_font
-
-# Profit margin color scale
-ws.conditional_formatting.add(f'D2:D{len(category_perf)+1}',
-    ColorScaleRule(start_type='min', start_color='F8696B',
-                   mid_type='percentile', mid_value=50, mid_color='FFEB84',
-                   end_type='max', end_color='63BE7B'))
-
-# Format Loss-Making Products - highlight negative profits
-ws = wb['Loss-Making Products']
-for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-    ws.column_dimensions[col].width = 15
-
-for cell in ws[1]:
-    cell.fill = header_fill
-    cell.font = header_font
-
 # Highlight negative profits in red
 red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
 red_font = Font(color="9C0006", bold=True)
 
-for row in ws.iter_rows(min_row=2, max_row=len(loss_makers)+1, min_col=6, max_col=6):
-    for cell in row:
-        cell.fill = red_fill
-        cell.font = red_font
-
-wb.save(excel_file)
-
-print(f"\n✓ Excel report saved: {excel_file}")
-print("\nReport includes:")
-print("  • Executive Summary (KPIs)")
-print("  • City Performance (with heatmaps)")
-print("  • Category Analysis")
-print("  • Monthly Trends")
-print("  • Discount Analysis")
-print("  • Loss-Making Products")
-print("  • Delivery Performance")
-print("  • Peak Hours Analysis")
-
-print("\n" + "="*70)
-print("EXCEL REPORT GENERATION COMPLETE")
-print("="*70)
\ No newline at end of file
+
+def load_report_data():
+    """Load cleaned data and derive the report columns once."""
+    df = pd.read_csv('blinkit_master_data.csv')
+    df_detailed = pd.read_csv('blinkit_detailed_data.csv')
+
+    # Ensure datetime
+    df['order_date'] = pd.to_datetime(df['order_date'])
+    df['month'] = df['order_date'].dt.to_period('M').astype(str)
+
+    df['discount_pct'] = (df['discount_amount'] / (df['revenue'] + df['discount_amount']) * 100).round(2)
+    df['discount_bucket'] = pd.cut(df['discount_pct'],
+                                    bins=[0, 5, 10, 15, 100],
+                                    labels=['0-5%', '5-10%', '10-15%', '>15%'])
+    df['hour'] = df['order_time'].str.split(':').str[0].astype(int)
+
+    return df, df_detailed
+
+
+def build_report_sheets(df, df_detailed, verbose=True):
+    """Compute the report sheets; returns {sheet name: DataFrame}."""
+    log = print if verbose else (lambda *args: None)
+    sheets = {}
+
+    # ========================================================================
+    # SHEET 1: EXECUTIVE SUMMARY
+    # ========================================================================
+    log("\n[1] Creating Executive Summary...")
+
+    summary_data = {
+        'Metric': [
+            'Total Revenue (₹)',
+            'Total Profit (₹)',
+            'Overall Profit Margin (%)',
+            'Total Orders',
+            'Delivered Orders',
+            'Cancelled Orders (%)',
+            'Avg Order Value (₹)',
+            'Avg Delivery Time (min)',
+            'SLA Breach Rate (%)',
+            'Repeat Customer Rate (%)',
+            'Avg Discount (%)'
+        ],
+        'Value': [
+            f"{df['revenue'].sum():,.0f}",
+            f"{df['profit'].sum():,.0f}",
+            f"{(df['profit'].sum() / df['revenue'].sum() * 100):.2f}",
+            f"{len(df):,}",
+            f"{len(df[df['order_status']=='Delivered']):,}",
+            f"{(len(df[df['order_status']=='Cancelled']) / len(df) * 100):.2f}",
+            f"{df['revenue'].mean():,.2f}",
+            f"{df['delivery_time_minutes'].mean():.1f}",
+            f"{(df['delivery_sla_breach'].mean() * 100):.2f}",
+            f"{(df['repeat_customer_flag'].mean() * 100):.2f}",
+            f"{((df['discount_amount'] / (df['revenue'] + df['discount_amount'])) * 100).mean():.2f}"
+        ]
+    }
+    sheets['Executive Summary'] = pd.DataFrame(summary_data)
+
+    # ========================================================================
+    # SHEET 2: CITY PERFORMANCE
+    # ========================================================================
+    log("[2] Creating City Performance Analysis...")
+
+    city_perf = df.groupby('city').agg({
+        'revenue': 'sum',
+        'profit': 'sum',
+        'order_id': 'count',
+        'delivery_time_minutes': 'mean',
+        'delivery_sla_breach': 'mean',
+        'repeat_customer_flag': 'mean'
+    }).round(2)
+
+    city_perf.columns = ['Revenue', 'Profit', 'Orders', 'Avg_Delivery_Time',
+                         'SLA_Breach_Rate', 'Repeat_Customer_Rate']
+    city_perf['Profit_Margin_%'] = (city_perf['Profit'] / city_perf['Revenue'] * 100).round(2)
+    city_perf['Revenue_Per_Order'] = (city_perf['Revenue'] / city_perf['Orders']).round(2)
+    sheets['City Performance'] = city_perf.sort_values('Profit', ascending=False).reset_index()
+
+    # ========================================================================
+    # SHEET 3: CATEGORY ANALYSIS
+    # ========================================================================
+    log("[3] Creating Category Analysis...")
+
+    category_perf = df_detailed.groupby('category').agg({
+        'selling_price': 'sum',
+        'profit': 'sum',
+        'order_id': 'nunique'
+    }).round(2)
+
+    category_perf.columns = ['Revenue', 'Profit', 'Orders']
+    category_perf['Profit_Margin_%'] = (category_perf['Profit'] / category_perf['Revenue'] * 100).round(2)
+    category_perf['Avg_Order_Value'] = (category_perf['Revenue'] / category_perf['Orders']).round(2)
+    sheets['Category Analysis'] = category_perf.sort_values('Revenue', ascending=False).reset_index()
+
+    # ========================================================================
+    # SHEET 4: MONTHLY TRENDS
+    # ========================================================================
+    log("[4] Creating Monthly Trends...")
+
+    monthly_trends = df.groupby('month').agg({
+        'revenue': 'sum',
+        'profit': 'sum',
+        'order_id': 'count',
+        'delivery_time_minutes': 'mean'
+    }).round(2)
+
+    monthly_trends.columns = ['Revenue', 'Profit', 'Orders', 'Avg_Delivery_Time']
+    monthly_trends['Profit_Margin_%'] = (monthly_trends['Profit'] / monthly_trends['Revenue'] * 100).round(2)
+    monthly_trends['Revenue_Growth_%'] = monthly_trends['Revenue'].pct_change() * 100
+    monthly_trends['Order_Growth_%'] = monthly_trends['Orders'].pct_change() * 100
+    sheets['Monthly Trends'] = monthly_trends.round(2).reset_index()
+
+    # ========================================================================
+    # SHEET 5: DISCOUNT ANALYSIS
+    # ========================================================================
+    log("[5] Creating Discount Analysis...")
+
+    discount_analysis = df.groupby('discount_bucket', observed=False).agg({
+        'profit_margin_pct': 'mean',
+        'revenue': 'sum',
+        'profit': 'sum',
+        'order_id': 'count'
+    }).round(2)
+
+    discount_analysis.columns = ['Avg_Profit_Margin_%', 'Total_Revenue', 'Total_Profit', 'Orders']
+    discount_analysis['Revenue_Per_Order'] = (discount_analysis['Total_Revenue'] / discount_analysis['Orders']).round(2)
+    sheets['Discount Analysis'] = discount_analysis.reset_index()
+
+    # ========================================================================
+    # SHEET 6: LOSS-MAKING PRODUCTS
+    # ========================================================================
+    log("[6] Identifying Loss-Making Products...")
+
+    # Top loss-makers per city (SQL query 3), selected without sorting every row
+    sheets['Loss-Making Products'] = top_loss_makers(df_detailed, LOSS_MAKERS_PER_CITY)
+
+    # ========================================================================
+    # SHEET 7: DELIVERY PERFORMANCE
+    # ========================================================================
+    log("[7] Creating Delivery Performance Report...")
+
+    delivery_perf = df.groupby(['city', 'delivery_sla_breach']).agg({
+        'order_id': 'count',
+        'delivery_time_minutes': 'mean',
+        'repeat_customer_flag': 'mean'
+    }).round(2)
+
+    delivery_perf.columns = ['Orders', 'Avg_Delivery_Time', 'Repeat_Customer_Rate']
+    delivery_perf = delivery_perf.reset_index()
+    delivery_perf['SLA_Status'] = delivery_perf['delivery_sla_breach'].map({0: 'On-Time', 1: 'Delayed'})
+    sheets['Delivery Performance'] = delivery_perf[['city', 'SLA_Status', 'Orders',
+                                                    'Avg_Delivery_Time', 'Repeat_Customer_Rate']]
+
+    # ========================================================================
+    # SHEET 8: PEAK HOURS ANALYSIS
+    # ========================================================================
+    log("[8] Creating Peak Hours Analysis...")
+
+    hourly_analysis = df.groupby('hour').agg({
+        'order_id': 'count',
+        'delivery_time_minutes': 'mean',
+        'delivery_sla_breach': 'mean',
+        'revenue': 'sum'
+    }).round(2)
+
+    hourly_analysis.columns = ['Orders', 'Avg_Delivery_Time', 'SLA_Breach_Rate', 'Revenue']
+    hourly_analysis['Revenue_Per_Order'] = (hourly_analysis['Revenue'] / hourly_analysis['Orders']).round(2)
+    sheets['Peak Hours'] = hourly_analysis.reset_index()
+
+    # ========================================================================
+    # SHEET 9: PRODUCT SEGMENTS (RFM)
+    # ========================================================================
+    log("[9] Creating Product Segmentation (RFM)...")
+
+    segments = product_rfm_segments(df_detailed)
+    segments['Last_Order_Date'] = segments['Last_Order_Date'].dt.date
+    segments = segments.rename(columns={'product_id': 'Product_ID', 'category': 'Category'})
+    sheets['Product Segments'] = segments.round(2)
+
+    return sheets
+
+
+def apply_formatting(wb, sheets):
+    """Apply header styles and conditional formatting to an in-memory workbook."""
+    n_cities = len(sheets['City Performance'])
+    n_categories = len(sheets['Category Analysis'])
+    n_loss_makers = len(sheets['Loss-Making Products'])
+
+    # Format Executive Summary
+    ws = wb['Executive Summary']
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 20
+
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    # Format City Performance with conditional formatting
+    ws = wb['City Performance']
+
+    # Set column widths
+    for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
+        ws.column_dimensions[col].width = 15
+
+    # Apply headers
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+
+    # Scoped reports can have empty sheets; openpyxl rejects ranges like D2:D1
+    if n_cities:
+        # Profit Margin heatmap (Column H)
+        ws.conditional_formatting.add(f'H2:H{n_cities+1}',
+            ColorScaleRule(start_type='min', start_color='F8696B',
+                           mid_type='percentile', mid_value=50, mid_color='FFEB84',
+                           end_type='max', end_color='63BE7B'))
+
+        # Revenue bar chart (Column B)
+        ws.conditional_formatting.add(f'B2:B{n_cities+1}',
+            DataBarRule(start_type='min', start_value=0, end_type='max',
+                        color="5A8AC6", showValue=True))
+
+    # Format Category Analysis
+    ws = wb['Category Analysis']
+    for col in ['A', 'B', 'C', 'D', 'E', 'F']:
+        ws.column_dimensions[col].width = 20
+
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+
+    # Profit margin color scale
+    if n_categories:
+        ws.conditional_formatting.add(f'D2:D{n_categories+1}',
+            ColorScaleRule(start_type='min', start_color='F8696B',
+                           mid_type='percentile', mid_value=50, mid_color='FFEB84',
+                           end_type='max', end_color='63BE7B'))
+
+    # Format Loss-Making Products - highlight negative profits
+    ws = wb['Loss-Making Products']
+    for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
+        ws.column_dimensions[col].width = 15
+
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+
+    if n_loss_makers:
+        for row in ws.iter_rows(min_row=2, max_row=n_loss_makers+1, min_col=6, max_col=6):
+            for cell in row:
+                cell.fill = red_fill
+                cell.font = red_font
+
+    # Format Product Segments - flag loss-maker segment
+    ws = wb['Product Segments']
+    segments = sheets['Product Segments']
+    for col in range(1, len(segments.columns) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 15
+
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+
+    if len(segments):
+        segment_col = get_column_letter(segments.columns.get_loc('Segment') + 1)
+        ws.conditional_formatting.add(f'{segment_col}2:{segment_col}{len(segments)+1}',
+            CellIsRule(operator='equal', formula=['"Loss-Maker"'], fill=red_fill, font=red_font))
+
+
+def write_report(sheets, excel_file):
+    """Write the sheets and formatting in a single pass (no reload of the file)."""
+    with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+        for sheet_name, sheet_df in sheets.items():
+            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        apply_formatting(writer.book, sheets)
+
+
+def _report_filename(scope, key):
+    safe_key = re.sub(r'[^A-Za-z0-9_-]+', '_', str(key)).strip('_')
+    return f'Blinkit_Management_Report_{scope}_{safe_key}.xlsx'
+
+
+def _build_scoped_report(scope, key, df_part, detailed_part, output_dir):
+    """Worker task: build and save one scoped workbook."""
+    excel_file = os.path.join(output_dir, _report_filename(scope, key))
+    write_report(build_report_sheets(df_part, detailed_part, verbose=False), excel_file)
+    return excel_file
+
+
+def partition_report_data(df, df_detailed, scope):
+    """Split both frames by scope in one grouping pass each."""
+    column = BATCH_SCOPES[scope]
+    detailed_groups = df_detailed.groupby(column, sort=False).indices
+    empty = df_detailed.iloc[:0]
+
+    for key, positions in df.groupby(column, sort=False).indices.items():
+        detailed_positions = detailed_groups.get(key)
+        detailed_part = empty if detailed_positions is None else df_detailed.iloc[detailed_positions]
+        yield key, df.iloc[positions], detailed_part
+
+
+def generate_batch_reports(df, df_detailed, scope, output_dir, workers):
+    """Fan out one workbook per city/store over a bounded process pool.
+
+    A failing scope doesn't stop the batch; returns (saved files, failed scopes).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    generated, failed = [], []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_build_scoped_report, scope, key, df_part, detailed_part, output_dir): key
+                   for key, df_part, detailed_part in partition_report_data(df, df_detailed, scope)}
+        print(f"  Submitted {len(futures):,} {scope} workbooks to {workers} workers")
+        for future in as_completed(futures):
+            try:
+                generated.append(future.result())
+            except Exception as exc:
+                failed.append((futures[future], exc))
+
+    elapsed = time.perf_counter() - start
+    rate = len(generated) / elapsed * 60 if elapsed > 0 else float('inf')
+    print(f"\n✓ {len(generated):,} workbooks saved to {output_dir}/")
+    print(f"  Elapsed: {elapsed:.1f}s | Throughput: {rate:,.1f} workbooks/min")
+    if failed:
+        print(f"\n✗ {len(failed):,} {scope} workbooks failed:")
+        for key, exc in sorted(failed, key=lambda item: str(item[0])):
+            print(f"  - {key}: {type(exc).__name__}: {exc}")
+    return generated, failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate Blinkit Excel management reports')
+    parser.add_argument('--by', choices=sorted(BATCH_SCOPES), default=None,
+                        help='batch mode: one workbook per city or store')
+    parser.add_argument('-w', '--workers', type=int,
+                        default=min(MAX_WORKERS, os.cpu_count() or 1),
+                        help=f'worker processes for batch mode (default: min({MAX_WORKERS}, CPU count))')
+    parser.add_argument('-o', '--output-dir', default='reports',
+                        help='output directory for batch mode (default: reports)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("="*70)
+    print("GENERATING EXCEL MANAGEMENT REPORT")
+    print("="*70)
+
+    df, df_detailed = load_report_data()
+
+    if args.by:
+        output_dir = os.path.join(args.output_dir, args.by)
+        print(f"\n[Batch] Generating one report per {args.by}...")
+        _, failed = generate_batch_reports(df, df_detailed, args.by, output_dir, max(1, args.workers))
+        if failed:
+            sys.exit(1)
+    else:
+        sheets = build_report_sheets(df, df_detailed)
+
+        # ====================================================================
+        # APPLY FORMATTING (using openpyxl)
+        # ====================================================================
+        print("\n[10] Applying conditional formatting...")
+        write_report(sheets, EXCEL_FILE)
+
+        print(f"\n✓ Excel report saved: {EXCEL_FILE}")
+        print("\nReport includes:")
+        print("  • Executive Summary (KPIs)")
+        print("  • City Performance (with heatmaps)")
+        print("  • Category Analysis")
+        print("  • Monthly Trends")
+        print("  • Discount Analysis")
+        print(f"  • Loss-Making Products (top {LOSS_MAKERS_PER_CITY} per city)")
+        print("  • Delivery Performance")
+        print("  • Peak Hours Analysis")
+        print("  • Product Segments (RFM)")
+
+    print("\n" + "="*70)
+    print("EXCEL REPORT GENERATION COMPLETE")
+    print("="*70)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
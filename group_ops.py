@@ -0,0 +1,167 @@
+"""
+Blinkit Sales Performance Analytics - Grouped Array Operators
+Vectorized equivalents of SQL window functions over factorized group codes
+
+- grouped_ntile:  NTILE(n) OVER (PARTITION BY group ORDER BY value)
+- grouped_top_k:  ROW_NUMBER() ... WHERE rank <= k, via partial selection
+- product_rfm_segments / top_loss_makers: SQL queries 7 and 3 on the
+  detailed order-line data
+
+Group codes are dense non-negative integers, e.g. from pd.factorize or
+groupby(...).ngroup(), so the operators scale to millions of groups.
+"""
+
+import pandas as pd
+import numpy as np
+
+RFM_TILES = 4
+LOSS_MAKERS_PER_CITY = 5
+
+
+def _group_layout(codes):
+    """Permutation that makes each group contiguous, plus group starts and sizes.
+
+    Only the integer codes are sorted here, never the values.
+    """
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return order, starts, counts
+
+
+def grouped_ntile(values, codes, n, ascending=True):
+    """Bucket each row into 1..n within its group, with SQL NTILE semantics.
+
+    Groups of m rows get m // n rows per bucket and the first m % n buckets
+    take one extra row. Ties keep their input order.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    if not ascending:
+        values = -values
+
+    order = np.lexsort((values, codes))
+    counts = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    sorted_codes = codes[order]
+    rank = np.arange(len(order)) - starts[sorted_codes]      # 0-based rank within group
+    size = counts[sorted_codes]
+    base, extra = size // n, size % n
+    big_rows = extra * (base + 1)                             # rows in the larger buckets
+    bucket = np.where(rank < big_rows,
+                      rank // (base + 1),
+                      extra + (rank - big_rows) // np.maximum(base, 1))
+
+    tiles = np.empty(len(order), dtype=np.int64)
+    tiles[order] = bucket + 1
+    return tiles
+
+
+def grouped_top_k(values, codes, k, largest=False):
+    """Row indices of the k smallest (or largest) values in every group.
+
+    Returns (rows, ranks) ordered by group code then rank (1-based). Groups are
+    padded to the next power of two in size classes, so np.argpartition can
+    select per group along axis 1 with at most 2x padding and no global sort.
+    NaN values are never selected.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    if largest:
+        values = -values
+    values = np.where(np.isnan(values), np.inf, values)
+
+    order, starts, counts = _group_layout(codes)
+    grouped_values = values[order]
+    size_class = np.ceil(np.log2(np.maximum(counts, 1))).astype(np.int64)
+
+    rows, ranks, groups = [], [], []
+    for cls in np.unique(size_class[counts > 0]):
+        members = np.flatnonzero((size_class == cls) & (counts > 0))
+        width = 1 << int(cls)
+        offsets = np.arange(width)
+        valid = offsets < counts[members, None]
+        positions = np.where(valid, starts[members, None] + offsets, 0)
+        block = np.where(valid, grouped_values[positions], np.inf)
+
+        kk = min(k, width)
+        if kk < width:
+            picked = np.argpartition(block, kk - 1, axis=1)[:, :kk]
+        else:
+            picked = np.broadcast_to(offsets, block.shape)
+        # Order the k picks (small) by value
+        picked = np.take_along_axis(
+            picked, np.argsort(np.take_along_axis(block, picked, axis=1), axis=1, kind='stable'), axis=1)
+
+        keep = (np.take_along_axis(valid, picked, axis=1)
+                & np.isfinite(np.take_along_axis(block, picked, axis=1)))
+        rows.append(order[np.take_along_axis(positions, picked, axis=1)][keep])
+        ranks.append(np.broadcast_to(np.arange(1, kk + 1), picked.shape)[keep])
+        groups.append(np.broadcast_to(members[:, None], picked.shape)[keep])
+
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows, ranks, groups = np.concatenate(rows), np.concatenate(ranks), np.concatenate(groups)
+    final = np.lexsort((ranks, groups))
+    return rows[final], ranks[final]
+
+
+def top_loss_makers(df_detailed, k=LOSS_MAKERS_PER_CITY, group_by='city'):
+    """SQL query 3: the k most loss-making (product, category, city) rows per group."""
+    product_performance = df_detailed.groupby(['product_id', 'category', 'city'], observed=True).agg(
+        Revenue=('selling_price', 'sum'),
+        Cost=('cost_price', 'sum'),
+        Profit=('profit', 'sum'),
+        Orders=('order_id', 'count'),
+    ).reset_index()
+
+    losses = product_performance[product_performance['Profit'] < 0].reset_index(drop=True)
+    codes = pd.factorize(losses[group_by], sort=True)[0]
+    rows, ranks = grouped_top_k(losses['Profit'].to_numpy(), codes, k)
+
+    loss_makers = losses.iloc[rows].reset_index(drop=True)
+    loss_makers.columns = ['Product_ID', 'Category', 'City', 'Revenue', 'Cost', 'Profit', 'Orders']
+    loss_makers['Profit_Margin_%'] = (loss_makers['Profit'] / loss_makers['Revenue'] * 100).round(2)
+    loss_makers['Loss_Rank'] = ranks
+    return loss_makers
+
+
+def product_rfm_segments(df_detailed, group_by=None, n_tiles=RFM_TILES):
+    """SQL query 7: recency/frequency/profit NTILE scores and product segments.
+
+    Scores are oriented so that n_tiles is best (most recent, most frequent,
+    most profitable). With group_by (e.g. 'city') products are scored within
+    each group instead of against the whole catalog. Recency is measured from
+    the latest order date in the data.
+    """
+    keys = ['product_id', 'category'] + ([group_by] if group_by else [])
+    delivered = df_detailed[df_detailed['order_status'] == 'Delivered']
+    order_dates = pd.to_datetime(delivered['order_date'])
+
+    metrics = delivered.assign(order_date=order_dates).groupby(keys, observed=True).agg(
+        Frequency=('order_id', 'nunique'),
+        Revenue=('selling_price', 'sum'),
+        Profit=('profit', 'sum'),
+        Last_Order_Date=('order_date', 'max'),
+    ).reset_index()
+    metrics['Recency_Days'] = (order_dates.max() - metrics['Last_Order_Date']).dt.days
+
+    codes = (pd.factorize(metrics[group_by], sort=True)[0] if group_by
+             else np.zeros(len(metrics), dtype=np.int64))
+    recency = grouped_ntile(metrics['Recency_Days'], codes, n_tiles, ascending=False)
+    frequency = grouped_ntile(metrics['Frequency'], codes, n_tiles)
+    profit = grouped_ntile(metrics['Profit'], codes, n_tiles)
+    metrics['R_Score'], metrics['F_Score'], metrics['P_Score'] = recency, frequency, profit
+
+    top = n_tiles - 1
+    metrics['Segment'] = np.select(
+        [(recency >= top) & (frequency >= top) & (profit >= top),
+         (recency >= top) & (frequency >= top - 1),
+         profit >= top,
+         metrics['Recency_Days'] > 90,
+         metrics['Profit'] < 0],
+        ['Champion', 'Loyal', 'High-Value', 'Dormant', 'Loss-Maker'],
+        default='Standard')
+
+    return metrics.sort_values('Profit', ascending=False).reset_index(drop=True)
@@ -0,0 +1,106 @@
+"""
+Blinkit Sales Performance Analytics - KPI Service Load Test
+Drives kpi_service.py with concurrent keep-alive connections and reports
+p50/p99 latency and requests/sec
+
+Most requests hit popular (pre-warmed) queries; the rest use random
+city/date filters to exercise cache misses and the executor.
+
+Usage:
+    python kpi_loadtest.py --connections 32 --duration 15
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+CITIES = ['Mumbai', 'Delhi', 'Bangalore', 'Hyderabad', 'Chennai', 'Pune', 'Kolkata']
+ENDPOINTS = ['/kpis/summary', '/breakdown/city', '/breakdown/category',
+             '/breakdown/hour', '/breakdown/discount']
+
+
+def random_target(rng, popular_share):
+    endpoint = rng.choice(ENDPOINTS)
+    if rng.random() < popular_share:
+        return endpoint if rng.random() < 0.5 else f"{endpoint}?city={rng.choice(CITIES)}"
+    month = rng.randint(1, 12)
+    return (f"{endpoint}?city={rng.choice(CITIES)}"
+            f"&start_date=2024-{month:02d}-01&end_date=2024-{month:02d}-28")
+
+
+async def client(host, port, deadline, latencies, errors, seed, popular_share):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            target = random_target(rng, popular_share)
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, connections, duration, popular_share):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, deadline, latencies, errors, seed, popular_share)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    health = json.loads((await reader.read()).split(b'\r\n\r\n', 1)[1])
+    writer.close()
+    return np.array(latencies) * 1000, errors, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test for kpi_service.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('-c', '--connections', type=int, default=16)
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds')
+    parser.add_argument('--popular-share', type=float, default=0.9,
+                        help='share of requests for popular (cacheable) queries')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("KPI SERVICE LOAD TEST")
+    print("="*70)
+    print(f"\n{args.connections} connections for {args.duration:.0f}s against "
+          f"http://{args.host}:{args.port}...")
+
+    latencies, errors, elapsed, health = asyncio.run(
+        run(args.host, args.port, args.connections, args.duration, args.popular_share))
+
+    print(f"\n✓ Requests:     {len(latencies):,} ({len(errors)} errors)")
+    print(f"  Throughput:   {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"  Latency p50:  {np.percentile(latencies, 50):.2f} ms")
+    print(f"  Latency p99:  {np.percentile(latencies, 99):.2f} ms")
+    print(f"  Latency max:  {latencies.max():.2f} ms")
+    print(f"  Cache:        {health['cache']}")
+    print("\n" + "="*70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+"""
+Blinkit Sales Performance Analytics - Local KPI Query Service
+Small asyncio HTTP service that loads the processed data once and answers
+KPI queries as JSON, so analysts don't re-run data_analysis.py for one number
+
+Endpoints (GET, all accept the filters below):
+    /health
+    /kpis/summary            executive-summary KPIs
+    /breakdown/city          city performance
+    /breakdown/category      category performance
+    /breakdown/hour          peak-hours analysis
+    /breakdown/discount      discount-bucket analysis
+
+Filters: city, store_id, category, order_status, start_date, end_date (YYYY-MM-DD)
+
+Usage:
+    python kpi_service.py --port 8050
+    curl 'http://127.0.0.1:8050/kpis/summary?city=Mumbai&start_date=2024-06-01'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+CACHE_SIZE = 1024
+CACHE_TTL_SECONDS = 300
+EXECUTOR_WORKERS = min(4, os.cpu_count() or 1)
+FILTER_PARAMS = ('city', 'store_id', 'category', 'order_status', 'start_date', 'end_date')
+
+
+class QueryError(ValueError):
+    """Bad request parameters (returned as HTTP 400)."""
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self):
+        return {'entries': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+def _records(frame):
+    return json.loads(frame.reset_index().to_json(orient='records', double_precision=4))
+
+
+class KPIStore:
+    """Processed data held in memory, with the aggregations behind each endpoint."""
+
+    def __init__(self, master_path='blinkit_master_data.csv', detailed_path='blinkit_detailed_data.csv'):
+        df = pd.read_csv(master_path)
+        df['order_date'] = pd.to_datetime(df['order_date'])
+        df['discount_pct'] = (df['discount_amount'] / df['order_value'] * 100).round(2)
+        df['discount_bucket'] = pd.cut(df['discount_pct'],
+                                       bins=[0, 5, 10, 15, 100],
+                                       labels=['0-5%', '5-10%', '10-15%', '>15%'])
+        for column in ('city', 'store_id', 'order_status'):
+            df[column] = df[column].astype('category')
+
+        detailed = pd.read_csv(detailed_path, usecols=['order_id', 'category', 'selling_price', 'profit'])
+        detailed = detailed.merge(df[['order_id', 'city', 'store_id', 'order_status', 'order_date']],
+                                  on='order_id', how='left')
+        detailed['category'] = detailed['category'].astype('category')
+
+        self.df = df
+        self.detailed = detailed
+        # Orders containing at least one item from each category, built once for
+        # the known categories so query strings can't grow it
+        self.category_orders = {
+            category: df['order_id'].isin(detailed.loc[rows, 'order_id']).to_numpy()
+            for category, rows in detailed.groupby('category', observed=True).groups.items()
+        }
+
+    def _filter(self, frame, params, order_level):
+        mask = np.ones(len(frame), dtype=bool)
+        for column in ('city', 'store_id', 'order_status'):
+            if column in params:
+                mask &= (frame[column] == params[column]).to_numpy()
+        try:
+            if 'start_date' in params:
+                mask &= (frame['order_date'] >= pd.Timestamp(params['start_date'])).to_numpy()
+            if 'end_date' in params:
+                mask &= (frame['order_date'] <= pd.Timestamp(params['end_date'])).to_numpy()
+        except ValueError:
+            raise QueryError('start_date/end_date must be YYYY-MM-DD')
+
+        if 'category' in params:
+            if params['category'] not in self.category_orders:
+                raise QueryError(f"unknown category: {params['category']}")
+            if order_level:
+                mask &= self.category_orders[params['category']]
+            else:
+                mask &= (frame['category'] == params['category']).to_numpy()
+        return frame[mask]
+
+    def summary(self, params):
+        df = self._filter(self.df, params, order_level=True)
+        orders = len(df)
+        revenue, profit = df['revenue'].sum(), df['profit'].sum()
+        ratio = lambda num, den: round(float(num / den * 100), 2) if den else None
+        return {
+            'total_revenue': round(float(revenue), 2),
+            'total_profit': round(float(profit), 2),
+            'profit_margin_pct': ratio(profit, revenue),
+            'total_orders': orders,
+            'delivered_orders': int((df['order_status'] == 'Delivered').sum()),
+            'cancelled_orders_pct': ratio((df['order_status'] == 'Cancelled').sum(), orders),
+            'avg_order_value': round(float(df['revenue'].mean()), 2) if orders else None,
+            'avg_delivery_time': round(float(df['delivery_time_minutes'].mean()), 1) if orders else None,
+            'sla_breach_rate_pct': ratio(df['delivery_sla_breach'].sum(), orders),
+            'repeat_customer_rate_pct': ratio(df['repeat_customer_flag'].sum(), orders),
+            'avg_discount_pct': round(float(df['discount_pct'].mean()), 2) if orders else None,
+        }
+
+    def by_city(self, params):
+        df = self._filter(self.df, params, order_level=True)
+        city = df.groupby('city', observed=True).agg(
+            Revenue=('revenue', 'sum'),
+            Profit=('profit', 'sum'),
+            Orders=('order_id', 'count'),
+            Avg_Delivery_Time=('delivery_time_minutes', 'mean'),
+            SLA_Breach_Rate=('delivery_sla_breach', 'mean'),
+            Repeat_Customer_Rate=('repeat_customer_flag', 'mean'),
+        )
+        city['Profit_Margin_%'] = city['Profit'] / city['Revenue'] * 100
+        return _records(city.sort_values('Profit', ascending=False))
+
+    def by_category(self, params):
+        detailed = self._filter(self.detailed, params, order_level=False)
+        category = detailed.groupby('category', observed=True).agg(
+            Revenue=('selling_price', 'sum'),
+            Profit=('profit', 'sum'),
+            Orders=('order_id', 'nunique'),
+        )
+        category['Profit_Margin_%'] = category['Profit'] / category['Revenue'] * 100
+        return _records(category.sort_values('Revenue', ascending=False))
+
+    def by_hour(self, params):
+        df = self._filter(self.df, params, order_level=True)
+        hourly = df.groupby('hour').agg(
+            Orders=('order_id', 'count'),
+            Avg_Delivery_Time=('delivery_time_minutes', 'mean'),
+            SLA_Breach_Rate=('delivery_sla_breach', 'mean'),
+            Revenue=('revenue', 'sum'),
+        )
+        return _records(hourly)
+
+    def by_discount(self, params):
+        df = self._filter(self.df, params, order_level=True)
+        discount = df.groupby('discount_bucket', observed=False).agg(
+            Avg_Profit_Margin=('profit_margin_pct', 'mean'),
+            Total_Revenue=('revenue', 'sum'),
+            Total_Profit=('profit', 'sum'),
+            Orders=('order_id', 'count'),
+        )
+        return _records(discount)
+
+
+class KPIService:
+    """Routes requests to KPIStore through the cache and a worker-thread executor."""
+
+    def __init__(self, store, cache=None, workers=EXECUTOR_WORKERS):
+        self.store = store
+        self.cache = cache or TTLCache()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.routes = {
+            '/kpis/summary': store.summary,
+            '/breakdown/city': store.by_city,
+            '/breakdown/category': store.by_category,
+            '/breakdown/hour': store.by_hour,
+            '/breakdown/discount': store.by_discount,
+        }
+        self._in_flight = {}
+        self.requests = 0
+
+    async def query(self, path, params):
+        """Cached result for an endpoint; identical concurrent misses share one computation."""
+        unknown = set(params) - set(FILTER_PARAMS)
+        if unknown:
+            raise QueryError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+        key = (path, tuple(sorted(params.items())))
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        if key not in self._in_flight:
+            loop = asyncio.get_running_loop()
+            self._in_flight[key] = loop.run_in_executor(self.executor, self.routes[path], params)
+        try:
+            result = await asyncio.shield(self._in_flight[key])
+        finally:
+            self._in_flight.pop(key, None)
+        self.cache.put(key, result)
+        return result
+
+    async def prewarm(self):
+        """Populate the cache with the unfiltered views and each city's summary."""
+        popular = [(path, {}) for path in self.routes]
+        popular += [('/kpis/summary', {'city': city}) for city in self.store.df['city'].cat.categories]
+        popular += [('/breakdown/hour', {'city': city}) for city in self.store.df['city'].cat.categories]
+        await asyncio.gather(*(self.query(path, params) for path, params in popular))
+        return len(popular)
+
+    async def handle(self, method, target):
+        url = urlsplit(target)
+        if method != 'GET':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'only GET is supported'}
+        if url.path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'orders': len(self.store.df),
+                                   'requests': self.requests, 'cache': self.cache.stats()}
+        if url.path not in self.routes:
+            return HTTPStatus.NOT_FOUND, {'error': f'unknown endpoint {url.path}',
+                                          'endpoints': ['/health', *self.routes]}
+        params = dict(parse_qsl(url.query))
+        try:
+            return HTTPStatus.OK, {'filters': params, 'data': await self.query(url.path, params)}
+        except QueryError as exc:
+            return HTTPStatus.BAD_REQUEST, {'error': str(exc)}
+
+    async def serve_connection(self, reader, writer):
+        """Minimal HTTP/1.1 with keep-alive: request line + headers, no request bodies."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    status, payload, version = HTTPStatus.BAD_REQUEST, {'error': 'malformed request'}, 'HTTP/1.1'
+                else:
+                    self.requests += 1
+                    status, payload = await self.handle(method, target)
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                body = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_server(host, port, cache_ttl, cache_size, workers):
+    print("[1] Loading processed data...")
+    start = time.perf_counter()
+    store = KPIStore()
+    print(f"✓ {len(store.df):,} orders, {len(store.detailed):,} order lines "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    service = KPIService(store, TTLCache(cache_size, cache_ttl), workers)
+    print("[2] Pre-warming popular queries...")
+    start = time.perf_counter()
+    warmed = await service.prewarm()
+    print(f"✓ {warmed} queries cached ({time.perf_counter() - start:.2f}s)")
+
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"\n✓ Serving on http://{host}:{port} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local KPI query service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL_SECONDS, help='seconds')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='max cached results')
+    parser.add_argument('--workers', type=int, default=EXECUTOR_WORKERS, help='aggregation threads')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BLINKIT KPI QUERY SERVICE")
+    print("="*70)
+    try:
+        asyncio.run(run_server(args.host, args.port, args.cache_ttl, args.cache_size, args.workers))
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+Blinkit Sales Performance Analytics - KPI Significance Testing
+Bootstrap confidence intervals and permutation p-values for KPI comparisons,
+computed for every city/category at once
+
+Resamples are drawn as batched (resample x observation) index matrices over
+data laid out in contiguous (stratum, group) cells, so per-stratum statistics
+come from a single np.add.reduceat per chunk. Chunks bound memory and can be
+spread over a process pool.
+
+Usage:
+    python kpi_stats.py --resamples 5000 --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+N_RESAMPLES = 2000
+CONFIDENCE = 0.95
+MAX_CHUNK_CELLS = 20_000_000
+MAX_WORKERS = 8
+
+
+def _cell_layout(values, groups, strata):
+    """Sort observations into contiguous (stratum, group) cells.
+
+    Returns sorted values, per-observation cell ids, cell starts/sizes and the
+    stratum labels. Cell id = 2 * stratum + group, so every stratum owns two cells.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups).astype(np.int64)
+    if strata is None:
+        strata = np.zeros(len(values), dtype=np.int64)
+    strata_codes, labels = pd.factorize(pd.Series(strata), sort=True)
+
+    keep = ~np.isnan(values) & (strata_codes >= 0)
+    values, groups, strata_codes = values[keep], groups[keep], strata_codes[keep]
+
+    n_cells = 2 * len(labels)
+    cells = 2 * strata_codes + groups
+    order = np.argsort(cells, kind='stable')
+    sizes = np.bincount(cells, minlength=n_cells)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    return values[order], cells[order], starts, sizes, labels
+
+
+def _cell_means(matrix, starts, sizes):
+    """Row-wise means of each contiguous cell; empty cells give NaN."""
+    nonempty = sizes > 0
+    sums = np.full((matrix.shape[0], len(sizes)), np.nan)
+    sums[:, nonempty] = np.add.reduceat(matrix, starts[nonempty], axis=1)
+    return sums / np.where(nonempty, sizes, np.nan)
+
+
+def _resample_chunk(values, cells, starts, sizes, n_resamples, seed, permute):
+    """Bootstrap (or permutation) cell means for one chunk of resamples."""
+    rng = np.random.default_rng(seed)
+    n = len(values)
+
+    # Bootstrap: draw within each cell -> index = cell start + floor(u * cell size)
+    u = rng.random((n_resamples, n))
+    boot_idx = starts[cells] + (u * sizes[cells]).astype(np.int64)
+    boot = _cell_means(values[boot_idx], starts, sizes)
+    if not permute:
+        return boot, None
+
+    # Permutation: shuffle values within each stratum block (both cells of a
+    # stratum are adjacent), which relabels groups while keeping strata intact
+    del u, boot_idx
+    shuffled = np.empty((n_resamples, n))
+    stratum_starts = starts[0::2]
+    stratum_ends = stratum_starts + sizes[0::2] + sizes[1::2]
+    for a, b in zip(stratum_starts, stratum_ends):
+        if b > a:
+            shuffled[:, a:b] = rng.permuted(np.broadcast_to(values[a:b], (n_resamples, b - a)), axis=1)
+    perm = _cell_means(shuffled, starts, sizes)
+    return boot, perm
+
+
+def _run_chunks(layout, n_resamples, seed, permute, workers):
+    values, cells, starts, sizes, _ = layout
+    chunk = max(1, MAX_CHUNK_CELLS // max(len(values), 1))
+    counts = [min(chunk, n_resamples - i) for i in range(0, n_resamples, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    args = [(values, cells, starts, sizes, c, s, permute) for c, s in zip(counts, seeds)]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_resample_chunk, *zip(*args)))
+    else:
+        results = [_resample_chunk(*a) for a in args]
+
+    boot = np.concatenate([r[0] for r in results])
+    perm = np.concatenate([r[1] for r in results]) if permute else None
+    return boot, perm
+
+
+def compare_means(values, groups, strata=None, n_resamples=N_RESAMPLES,
+                  confidence=CONFIDENCE, workers=1, seed=42):
+    """Difference in means (group 1 - group 0) per stratum with CI and p-value.
+
+    CIs are percentile bootstrap intervals resampled within each (stratum, group)
+    cell; p-values are two-sided permutation tests that shuffle group labels
+    within each stratum.
+    """
+    layout = _cell_layout(values, groups, strata)
+    sorted_values, _, starts, sizes, labels = layout
+    observed = _cell_means(sorted_values[None, :], starts, sizes)[0].reshape(-1, 2)
+    boot, perm = _run_chunks(layout, n_resamples, seed, True, workers)
+
+    diff = observed[:, 1] - observed[:, 0]
+    boot_diff = boot[:, 1::2] - boot[:, 0::2]
+    perm_diff = perm[:, 1::2] - perm[:, 0::2]
+    tail = (1 - confidence) / 2 * 100
+    extreme = (np.abs(perm_diff) >= np.abs(diff) - 1e-12).sum(axis=0)
+
+    return pd.DataFrame({
+        'n_0': sizes[0::2],
+        'n_1': sizes[1::2],
+        'mean_0': observed[:, 0],
+        'mean_1': observed[:, 1],
+        'diff': diff,
+        'ci_low': np.nanpercentile(boot_diff, tail, axis=0),
+        'ci_high': np.nanpercentile(boot_diff, 100 - tail, axis=0),
+        'p_value': np.where(np.isnan(diff), np.nan, (extreme + 1) / (n_resamples + 1)),
+    }, index=pd.Index(labels, name='stratum'))
+
+
+def bootstrap_means(values, strata=None, n_resamples=N_RESAMPLES,
+                    confidence=CONFIDENCE, workers=1, seed=42):
+    """Mean per stratum with a percentile bootstrap CI."""
+    layout = _cell_layout(values, np.zeros(len(values), dtype=np.int64), strata)
+    sorted_values, _, starts, sizes, labels = layout
+    observed = _cell_means(sorted_values[None, :], starts, sizes)[0, 0::2]
+    boot, _ = _run_chunks(layout, n_resamples, seed, False, workers)
+
+    tail = (1 - confidence) / 2 * 100
+    return pd.DataFrame({
+        'n': sizes[0::2],
+        'mean': observed,
+        'ci_low': np.percentile(boot[:, 0::2], tail, axis=0),
+        'ci_high': np.percentile(boot[:, 0::2], 100 - tail, axis=0),
+    }, index=pd.Index(labels, name='stratum'))
+
+
+def with_overall(values, groups, strata, **kwargs):
+    """compare_means for the whole network followed by each stratum."""
+    overall = compare_means(values, groups, None, **kwargs).rename(index={0: 'All'})
+    return pd.concat([overall, compare_means(values, groups, strata, **kwargs)])
+
+
+def late_delivery_retention(df, **kwargs):
+    """A2: repeat-customer rate of customers with any SLA-breached order minus
+    customers always delivered on time, per city.
+
+    repeat_customer_flag is a customer attribute, so each customer is one
+    observation; testing orders would count a customer once per order.
+    """
+    customers = df.groupby('customer_id').agg(
+        repeat_customer_flag=('repeat_customer_flag', 'first'),
+        any_breach=('delivery_sla_breach', 'max'),
+        city=('city', 'first'),
+    )
+    return with_overall(customers['repeat_customer_flag'], customers['any_breach'],
+                        customers['city'], **kwargs)
+
+
+def _discount_groups(frame):
+    """Rows in the 0-5% and >15% buckets, with group 1 = >15%."""
+    buckets = frame[frame['discount_bucket'].isin(['0-5%', '>15%'])]
+    return buckets, (buckets['discount_bucket'] == '>15%').to_numpy()
+
+
+def high_discount_margin(frame, strata_column, **kwargs):
+    """A4: profit margin of >15% discount orders minus 0-5% discount orders (order-level frame)."""
+    buckets, high = _discount_groups(frame)
+    return with_overall(buckets['profit_margin_pct'], high, buckets[strata_column], **kwargs)
+
+
+def category_discount_margin(df_detailed, **kwargs):
+    """A4 per category, on one margin per order x category.
+
+    The discount bucket is an order attribute, so lines of the same order aren't
+    independent observations; resampling them would overstate significance.
+    """
+    cells = df_detailed.groupby(['order_id', 'category'], observed=True).agg(
+        selling_price=('selling_price', 'sum'),
+        profit=('profit', 'sum'),
+        discount_bucket=('discount_bucket', 'first'),
+    ).reset_index()
+    cells['profit_margin_pct'] = cells['profit'] / cells['selling_price'] * 100
+    buckets, high = _discount_groups(cells)
+    return compare_means(buckets['profit_margin_pct'], high, buckets['category'], **kwargs)
+
+
+def city_kpi_intervals(df, **kwargs):
+    """A3: per-city mean order profit margin and SLA breach rate with bootstrap CIs."""
+    margin = bootstrap_means(df['profit_margin_pct'], df['city'], **kwargs)
+    breach = bootstrap_means(df['delivery_sla_breach'] * 100, df['city'], **kwargs)
+    return pd.concat({'Profit_Margin_%': margin, 'SLA_Breach_%': breach}, axis=1)
+
+
+def format_effect(row, unit='', scale=1.0):
+    """One-line summary: estimate [CI] (p=...)."""
+    return (f"{row['diff'] * scale:+.2f}{unit} "
+            f"[{row['ci_low'] * scale:+.2f}, {row['ci_high'] * scale:+.2f}] "
+            f"(p={row['p_value']:.4f})")
+
+
+def load_order_frames():
+    """Master and detailed data with the A4 discount buckets attached."""
+    df = pd.read_csv('blinkit_master_data.csv')
+    df['discount_pct'] = (df['discount_amount'] / df['order_value'] * 100).round(2)
+    df['discount_bucket'] = pd.cut(df['discount_pct'],
+                                   bins=[0, 5, 10, 15, 100],
+                                   labels=['0-5%', '5-10%', '10-15%', '>15%']).astype(str)
+    df_detailed = pd.read_csv('blinkit_detailed_data.csv',
+                              usecols=['order_id', 'category', 'selling_price', 'profit'])
+    df_detailed = df_detailed.merge(df[['order_id', 'discount_bucket']], on='order_id', how='left')
+    return df, df_detailed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bootstrap/permutation significance for KPI comparisons')
+    parser.add_argument('-r', '--resamples', type=int, default=N_RESAMPLES)
+    parser.add_argument('-w', '--workers', type=int, default=min(MAX_WORKERS, os.cpu_count() or 1))
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    opts = dict(n_resamples=args.resamples, workers=max(1, args.workers), seed=args.seed)
+
+    print("="*70)
+    print("KPI SIGNIFICANCE TESTS")
+    print("="*70)
+    df, df_detailed = load_order_frames()
+    start = time.perf_counter()
+
+    print(f"\n[A2] Late delivery vs repeat-customer rate, per customer ({args.resamples:,} resamples)")
+    print("-"*70)
+    a2 = late_delivery_retention(df, **opts)
+    print((a2 * [1, 1, 100, 100, 100, 100, 100, 1]).round(4).to_string())
+
+    print("\n[A3] City KPIs with 95% bootstrap intervals")
+    print("-"*70)
+    a3 = city_kpi_intervals(df, **opts)
+    print(a3.round(2).to_string())
+
+    print("\n[A4] >15% vs 0-5% discount: profit margin difference (pp)")
+    print("-"*70)
+    a4_city = high_discount_margin(df, 'city', **opts)
+    a4_category = category_discount_margin(df_detailed, **opts)
+    print(pd.concat({'city': a4_city, 'category': a4_category}).round(4).to_string())
+
+    elapsed = time.perf_counter() - start
+    pd.concat({'A2_late_delivery_retention': a2,
+               'A4_discount_margin_city': a4_city,
+               'A4_discount_margin_category': a4_category}).to_csv('kpi_significance.csv')
+    a3.to_csv('kpi_city_intervals.csv')
+    print(f"\n✓ Saved: kpi_significance.csv, kpi_city_intervals.csv ({elapsed:.1f}s)")
+    print("\n" + "="*70)
+
+
+if __name__ == '__main__':
+    main()
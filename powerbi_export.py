@@ -0,0 +1,241 @@
+"""
+Blinkit Sales Performance Analytics - Power BI Star-Schema Export
+Converts the cleaned flat files into an integer-keyed star schema with
+pre-aggregated daily and monthly summary tables, written as compressed Parquet
+
+Run after data_analysis.py:
+    python powerbi_export.py [--output-dir powerbi_model]
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+import numpy as np
+import warnings
+warnings.filterwarnings('ignore')
+
+PARQUET_COMPRESSION = 'zstd'
+
+# Peak windows used by data_generation.py: 7-10 AM, 6-10 PM
+PEAK_HOURS = set(range(7, 11)) | set(range(18, 23))
+
+
+def _surrogate_keys(values):
+    """Map values to dense 1-based int32 keys (sorted, so keys are stable per run)."""
+    codes, uniques = pd.factorize(values, sort=True)
+    return (codes + 1).astype(np.int32), uniques
+
+
+def _month_key(dates):
+    return (dates.dt.year * 100 + dates.dt.month).astype(np.int32)
+
+
+def load_clean_data():
+    df = pd.read_csv('blinkit_master_data.csv', parse_dates=['order_date'])
+    df_detailed = pd.read_csv('blinkit_detailed_data.csv',
+                              usecols=['order_id', 'product_id', 'category', 'sub_category',
+                                       'selling_price', 'cost_price', 'profit'])
+    return df, df_detailed
+
+
+def build_dimensions(df, df_detailed):
+    """Build dimension tables and attach their surrogate keys to the frames."""
+    dims = {}
+
+    # Date dimension: one row per calendar day in range, key = YYYYMMDD
+    dates = pd.Series(pd.date_range(df['order_date'].min(), df['order_date'].max(), freq='D'))
+    dims['dim_date'] = pd.DataFrame({
+        'date_key': (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype(np.int32),
+        'date': dates.dt.date,
+        'year': dates.dt.year.astype(np.int16),
+        'quarter': dates.dt.quarter.astype(np.int8),
+        'month': dates.dt.month.astype(np.int8),
+        'month_key': _month_key(dates),
+        'month_name': dates.dt.strftime('%b'),
+        'day': dates.dt.day.astype(np.int8),
+        'day_of_week': dates.dt.dayofweek.astype(np.int8),
+        'day_name': dates.dt.strftime('%a'),
+        'is_weekend': dates.dt.dayofweek.isin([5, 6]).astype(np.int8),
+    })
+    df['date_key'] = (df['order_date'].dt.year * 10000 + df['order_date'].dt.month * 100
+                      + df['order_date'].dt.day).astype(np.int32)
+    df['month_key'] = _month_key(df['order_date'])
+
+    # Time dimension: one row per minute of the day, key = HHMM
+    minutes = np.arange(24 * 60)
+    hours, mins = minutes // 60, minutes % 60
+    dims['dim_time'] = pd.DataFrame({
+        'time_key': (hours * 100 + mins).astype(np.int16),
+        'time': [f"{h:02d}:{m:02d}" for h, m in zip(hours, mins)],
+        'hour': hours.astype(np.int8),
+        'minute': mins.astype(np.int8),
+        'is_peak_hour': np.isin(hours, list(PEAK_HOURS)).astype(np.int8),
+    })
+    time_parts = df['order_time'].str.split(':', expand=True).astype(int)
+    df['time_key'] = (time_parts[0] * 100 + time_parts[1]).astype(np.int16)
+
+    # City dimension
+    df['city_key'], cities = _surrogate_keys(df['city'])
+    dims['dim_city'] = pd.DataFrame({'city_key': np.arange(1, len(cities) + 1, dtype=np.int32),
+                                     'city': cities})
+
+    # Store dimension (snowflaked to city via city_key)
+    df['store_key'], stores = _surrogate_keys(df['store_id'])
+    store_city = df.drop_duplicates('store_key').set_index('store_key')['city_key']
+    dims['dim_store'] = pd.DataFrame({'store_key': np.arange(1, len(stores) + 1, dtype=np.int32),
+                                      'store_id': stores})
+    dims['dim_store']['city_key'] = dims['dim_store']['store_key'].map(store_city).astype(np.int32)
+
+    # Channel dimension
+    df['channel_key'], channels = _surrogate_keys(df['acquisition_channel'].fillna('Unknown'))
+    dims['dim_channel'] = pd.DataFrame({'channel_key': np.arange(1, len(channels) + 1, dtype=np.int32),
+                                        'acquisition_channel': channels})
+
+    # Product dimension
+    df_detailed['product_key'], products = _surrogate_keys(df_detailed['product_id'])
+    product_attrs = (df_detailed.drop_duplicates('product_key')
+                     .set_index('product_key')[['category', 'sub_category', 'selling_price', 'cost_price']])
+    dims['dim_product'] = pd.DataFrame({'product_key': np.arange(1, len(products) + 1, dtype=np.int32),
+                                        'product_id': products}).join(product_attrs, on='product_key')
+
+    return dims
+
+
+def build_facts(df, df_detailed):
+    """Integer-keyed order and order-line fact tables."""
+    df['order_key'] = np.arange(1, len(df) + 1, dtype=np.int32)
+    order_keys = df.set_index('order_id')['order_key']
+
+    fact_orders = pd.DataFrame({
+        'order_key': df['order_key'],
+        'date_key': df['date_key'],
+        'time_key': df['time_key'],
+        'store_key': df['store_key'],
+        'city_key': df['city_key'],
+        'channel_key': df['channel_key'],
+        'order_status': df['order_status'].astype('category'),
+        'payment_mode': df['payment_mode'].astype('category'),
+        'repeat_customer_flag': df['repeat_customer_flag'].astype(np.int8),
+        'delivery_time_minutes': df['delivery_time_minutes'].astype(np.int16),
+        'delivery_sla_breach': df['delivery_sla_breach'].astype(np.int8),
+        'order_value': df['order_value'].astype(np.float64),
+        'discount_amount': df['discount_amount'].astype(np.float64),
+        'final_amount': df['final_amount'].astype(np.float64),
+        'revenue': df['revenue'].astype(np.float64),
+        'profit': df['profit'].astype(np.float64),
+    })
+
+    fact_order_lines = pd.DataFrame({
+        'order_key': df_detailed['order_id'].map(order_keys).astype(np.int32),
+        'product_key': df_detailed['product_key'],
+        'selling_price': df_detailed['selling_price'].astype(np.float64),
+        'cost_price': df_detailed['cost_price'].astype(np.float64),
+        'profit': df_detailed['profit'].astype(np.float64),
+    })
+    # Denormalize the order-level keys most line-level visuals slice by
+    line_keys = df.set_index('order_key')[['date_key', 'store_key', 'city_key']]
+    fact_order_lines = fact_order_lines.join(line_keys, on='order_key')
+
+    return {'fact_orders': fact_orders, 'fact_order_lines': fact_order_lines}
+
+
+def _additive_order_measures(fact_orders, keys):
+    """Sums and counts only, so ratios stay correct under any slicer in DAX."""
+    orders = fact_orders.assign(
+        delivered_orders=(fact_orders['order_status'] == 'Delivered').astype(np.int32),
+        cancelled_orders=(fact_orders['order_status'] == 'Cancelled').astype(np.int32),
+    )
+    return orders.groupby(keys, sort=True, observed=True).agg(
+        orders=('order_key', 'size'),
+        delivered_orders=('delivered_orders', 'sum'),
+        cancelled_orders=('cancelled_orders', 'sum'),
+        revenue=('revenue', 'sum'),
+        profit=('profit', 'sum'),
+        order_value=('order_value', 'sum'),
+        discount_amount=('discount_amount', 'sum'),
+        delivery_minutes=('delivery_time_minutes', 'sum'),
+        sla_breaches=('delivery_sla_breach', 'sum'),
+        repeat_customer_orders=('repeat_customer_flag', 'sum'),
+    ).reset_index()
+
+
+def build_aggregates(facts, dims):
+    """Pre-aggregated daily and monthly summary tables for dashboard visuals."""
+    fact_orders = facts['fact_orders']
+    month_of_date = dims['dim_date'].set_index('date_key')['month_key']
+    fact_orders = fact_orders.assign(month_key=fact_orders['date_key'].map(month_of_date))
+
+    lines = facts['fact_order_lines'].join(
+        dims['dim_product'].set_index('product_key')['category'], on='product_key')
+    lines['month_key'] = lines['date_key'].map(month_of_date)
+
+    # Distinct order counts don't add up across categories/products/days, so the
+    # line aggregates carry only additive measures; count orders from fact_order_lines
+    category_measures = dict(
+        items=('product_key', 'size'),
+        revenue=('selling_price', 'sum'),
+        cost=('cost_price', 'sum'),
+        profit=('profit', 'sum'),
+    )
+
+    return {
+        'agg_daily_store': _additive_order_measures(fact_orders, ['date_key', 'store_key', 'city_key']),
+        'agg_daily_city_hour': _additive_order_measures(
+            fact_orders.assign(hour=(fact_orders['time_key'] // 100).astype(np.int8)),
+            ['date_key', 'city_key', 'hour']),
+        'agg_monthly_city': _additive_order_measures(fact_orders, ['month_key', 'city_key']),
+        'agg_daily_category': lines.groupby(['date_key', 'city_key', 'category'], sort=True)
+                                   .agg(**category_measures).reset_index(),
+        'agg_monthly_product': lines.groupby(['month_key', 'city_key', 'product_key'], sort=True)
+                                    .agg(**category_measures).reset_index(),
+    }
+
+
+def write_parquet(tables, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    total_bytes = 0
+    for name, table in tables.items():
+        path = os.path.join(output_dir, f'{name}.parquet')
+        table.to_parquet(path, engine='pyarrow', compression=PARQUET_COMPRESSION, index=False)
+        size = os.path.getsize(path)
+        total_bytes += size
+        print(f"  ✓ {name:<22} {len(table):>10,} rows  {size / 1024:>9,.1f} KB")
+    return total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the Power BI star schema as Parquet')
+    parser.add_argument('-o', '--output-dir', default='powerbi_model',
+                        help='output directory (default: powerbi_model)')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("POWER BI STAR-SCHEMA EXPORT")
+    print("="*70)
+    start = time.perf_counter()
+
+    print("\n[1] Loading cleaned datasets...")
+    df, df_detailed = load_clean_data()
+    print(f"✓ Orders: {len(df):,} rows | Order lines: {len(df_detailed):,} rows")
+
+    print("\n[2] Building dimensions...")
+    dims = build_dimensions(df, df_detailed)
+
+    print("[3] Building fact tables...")
+    facts = build_facts(df, df_detailed)
+
+    print("[4] Pre-aggregating daily and monthly summaries...")
+    aggregates = build_aggregates(facts, dims)
+
+    print(f"\n[5] Writing Parquet ({PARQUET_COMPRESSION}) to {args.output_dir}/")
+    total_bytes = write_parquet({**dims, **facts, **aggregates}, args.output_dir)
+
+    print(f"\n✓ Star schema exported: {total_bytes / 1024 / 1024:.2f} MB "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("\n" + "="*70)
+
+
+if __name__ == '__main__':
+    main()